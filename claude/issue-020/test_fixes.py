@@ -3,6 +3,7 @@
 Quick test to verify our fixes work for issue 020
 """
 
+import io
 import sys
 import os
 from pathlib import Path
@@ -11,16 +12,21 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import psutil_cygwin as psutil
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
+
+
+def _open_bytes(data):
+    """Stand-in for builtins.open that serves ``data`` from a fresh BytesIO"""
+    return lambda *args, **kwargs: io.BytesIO(data)
 
 def test_cpu_times_fix():
     """Test the CPU times fix."""
     print("🧪 Testing CPU times calculation fix...")
     
-    with patch('builtins.open', new_callable=mock_open) as mock_file:
+    with patch('builtins.open') as mock_file:
         with patch('os.sysconf', return_value=100):
             # This is the exact test case that was failing
-            mock_file.return_value.read.return_value = "cpu  100 200 300 400 500 600 700 800\n"
+            mock_file.side_effect = _open_bytes(b"cpu  100 200 300 400 500 600 700 800\n")
             times = psutil.cpu_times()
             
             print(f"   User time: {times.user} (expected: 1.0)")
@@ -38,7 +44,7 @@ def test_binary_data_fix():
     print("🧪 Testing binary data handling fix...")
     
     try:
-        with patch('builtins.open', mock_open(read_data=b'\x00\x01\x02\x03\x04\x05')):
+        with patch('builtins.open', _open_bytes(b'\x00\x01\x02\x03\x04\x05')):
             times = psutil.cpu_times()
             print(f"   Result: {type(times).__name__} (no TypeError)")
             print("   ✅ Binary data test PASSED")
@@ -60,14 +66,8 @@ def test_intermittent_errors_fix():
         if call_count % 3 == 0:  # Fail every 3rd call
             raise OSError("Intermittent failure")
         
-        # Return a mock file object
-        from unittest.mock import MagicMock
-        mock_file = MagicMock()
-        mock_file.read.return_value = "cpu  100 200 300 400\n"
-        mock_file.readline.return_value = "cpu  100 200 300 400\n"
-        mock_file.__enter__ = MagicMock(return_value=mock_file)
-        mock_file.__exit__ = MagicMock(return_value=None)
-        return mock_file
+        # Return an in-memory binary file, as /proc files are read as bytes
+        return io.BytesIO(b"cpu  100 200 300 400\n")
     
     with patch('builtins.open', side_effect=intermittent_failure):
         for _ in range(12):
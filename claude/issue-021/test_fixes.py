@@ -3,6 +3,7 @@
 Test verification script for issue 021 resolution
 """
 
+import io
 import sys
 import os
 from pathlib import Path
@@ -11,17 +12,22 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import psutil_cygwin as psutil
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
+
+
+def _open_bytes(data):
+    """Stand-in for builtins.open that serves ``data`` from a fresh BytesIO"""
+    return lambda *args, **kwargs: io.BytesIO(data)
 
 def test_cpu_times_system_index_fix():
     """Test that the CPU times system index is correct."""
     print("🧪 Testing CPU times system index fix...")
     
-    with patch('builtins.open', new_callable=mock_open) as mock_file:
+    with patch('builtins.open') as mock_file:
         with patch('os.sysconf', return_value=100):
             # Test data: "cpu  100 200 300 400 500 600 700 800"
             # Expected: user=1.0, system=3.0 (index 2), idle=4.0
-            mock_file.return_value.read.return_value = "cpu  100 200 300 400 500 600 700 800\n"
+            mock_file.side_effect = _open_bytes(b"cpu  100 200 300 400 500 600 700 800\n")
             times = psutil.cpu_times()
             
             print(f"   User time: {times.user} (expected: 1.0)")
@@ -39,10 +45,10 @@ def test_negative_cpu_values_fix():
     """Test that negative CPU values are handled correctly."""
     print("🧪 Testing negative CPU values fix...")
     
-    with patch('builtins.open', new_callable=mock_open) as mock_file:
+    with patch('builtins.open') as mock_file:
         with patch('os.sysconf', return_value=100):
             # Test with negative values
-            mock_file.return_value.read.return_value = "cpu  -1 -2 -3 -4\n"
+            mock_file.side_effect = _open_bytes(b"cpu  -1 -2 -3 -4\n")
             times = psutil.cpu_times()
             
             print(f"   User time: {times.user} (should be >= 0)")
@@ -61,7 +67,7 @@ def test_virtual_memory_binary_data_fix():
     print("🧪 Testing virtual_memory binary data fix...")
     
     try:
-        with patch('builtins.open', mock_open(read_data=b'\\x00\\x01\\x02\\x03\\x04\\x05')):
+        with patch('builtins.open', _open_bytes(b'\\x00\\x01\\x02\\x03\\x04\\x05')):
             mem = psutil.virtual_memory()
             print(f"   Result: {type(mem).__name__} (no TypeError)")
             print("   ✅ Virtual memory binary data test PASSED")
@@ -7,21 +7,58 @@ and detailed reporting of test results including edge cases and stress tests.
 """
 
 import os
+import re
 import sys
 import time
-import unittest
-import subprocess
-import argparse
-import json
-import gc
+import threading
+import importlib.util
+import fnmatch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
-from contextlib import contextmanager
-from io import StringIO
+from functools import lru_cache
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _project_root():
+    """Resolved directory containing this script (the project root)."""
+    return Path(__file__).resolve().parent
+
+
+@lru_cache(maxsize=None)
+def _cached_is_cygwin():
+    """Cygwin detection result, computed once per run."""
+    from psutil_cygwin.cygwin_check import is_cygwin
+    return is_cygwin()
+
+
+@lru_cache(maxsize=None)
+def _scan_tests(test_dir):
+    """Names of the test_*.py files in ``test_dir``, listed once per run."""
+    try:
+        with os.scandir(test_dir) as entries:
+            return tuple(sorted(e.name for e in entries
+                                if e.name.startswith('test_') and e.name.endswith('.py')))
+    except OSError:
+        return ()
+
 
 # Add the package to the path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(_project_root()))
+
+# Interpreter facts that cannot change during a run
+_PY_VERSION = sys.version.split()[0]
+_HAS_PROC = os.path.exists('/proc')
 
 # Test discovery patterns
 TEST_PATTERNS = {
@@ -32,12 +69,173 @@ TEST_PATTERNS = {
     'all': 'test_*.py'  # All test files
 }
 
+# Categories whose files still run one interpreter per file (they spawn
+# processes, exhaust file descriptors and force GC cycles)
+ISOLATED_CATEGORIES = {'stress'}
+
+# pytest-xdist is optional; without it in-process categories run serially
+HAS_XDIST = importlib.util.find_spec('xdist') is not None
+
+# Lines of stdout/stderr kept from a failing isolated test file
+OUTPUT_TAIL_LINES = 20
+
+# Closing summary of a test script's own run: unittest prints "Ran 10 tests
+# in 2.1s" then "OK" or "FAILED (failures=1, errors=2)", pytest prints
+# "1 failed, 9 passed, 2 skipped in 0.5s"
+_UNITTEST_RAN_RE = re.compile(r'^Ran (\d+) tests? in ', re.MULTILINE)
+_UNITTEST_STATUS_RE = re.compile(r'^(?:OK|FAILED)(?: \((.*)\))?$', re.MULTILINE)
+_PYTEST_COUNT_RE = re.compile(r'(\d+) (passed|failed|skipped|errors?|xfailed|xpassed)\b')
+
+# Wall-clock budget (seconds) shared by all isolated files of one category
+CATEGORY_TIMEOUT = 300
+
+
+def _resolve_jobs(parallel):
+    """Worker count for ``parallel``: True means one per CPU, falsy means 1."""
+    if parallel is True:
+        return os.cpu_count() or 1
+    return max(1, int(parallel or 1))
+
+
+def _category_result(status, **fields):
+    """A category result dict with every key the reports read filled in."""
+    result = {
+        'status': status,
+        'success': False,
+        'tests_run': 0,
+        'failures': 0,
+        'errors': 0,
+        'skipped': 0,
+        'duration': 0.0,
+        'files': [],
+    }
+    result.update(fields)
+    return result
+
+
+def _parse_test_summary(output):
+    """
+    Test counts from the summary a test script printed at the end of its run.
+    
+    Returns a dict with tests_run, failures, errors and skipped, counted the
+    way _ResultCollector counts them, or None if ``output`` has no summary.
+    """
+    counts = {'tests_run': 0, 'failures': 0, 'errors': 0, 'skipped': 0}
+    
+    ran = _UNITTEST_RAN_RE.findall(output)
+    if ran:
+        counts['tests_run'] = int(ran[-1])
+        status = _UNITTEST_STATUS_RE.findall(output)
+        for item in filter(None, (status[-1] if status else '').split(', ')):
+            key, _, value = item.partition('=')
+            if key in counts:
+                counts[key] = int(value)
+        return counts
+    
+    for line in reversed(output.splitlines()):
+        found = _PYTEST_COUNT_RE.findall(line)
+        if found and ' in ' in line:
+            for number, outcome in found:
+                counts['tests_run'] += int(number)
+                if outcome == 'failed':
+                    counts['failures'] += int(number)
+                elif outcome.startswith('error'):
+                    counts['errors'] += int(number)
+                elif outcome == 'skipped':
+                    counts['skipped'] += int(number)
+            return counts
+    return None
+
+
+def _dumps_report(data):
+    """Serialize ``data`` to indented JSON bytes, with orjson when available."""
+    import json
+    
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(data, indent=2, default=str).encode()
+
+
+def _drain(stream, buf):
+    """Feed lines from ``stream`` into the bounded ``buf`` until EOF."""
+    for line in stream:
+        buf.append(line.rstrip('\n'))
+    stream.close()
+
+
+def _run_streaming(cmd, cwd, timeout, env=None, tail_lines=OUTPUT_TAIL_LINES):
+    """
+    Run ``cmd`` keeping only the last ``tail_lines`` lines of each stream.
+    
+    Returns (returncode, stdout_tail, stderr_tail). On timeout the process
+    is killed and subprocess.TimeoutExpired is re-raised.
+    """
+    import subprocess
+    
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True, bufsize=1)
+    stdout_buf = deque(maxlen=tail_lines)
+    stderr_buf = deque(maxlen=tail_lines)
+    readers = [threading.Thread(target=_drain, args=(proc.stdout, stdout_buf), daemon=True),
+               threading.Thread(target=_drain, args=(proc.stderr, stderr_buf), daemon=True)]
+    for reader in readers:
+        reader.start()
+    
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join()
+    
+    return returncode, '\n'.join(stdout_buf), '\n'.join(stderr_buf)
+
+
+class _ResultCollector:
+    """pytest plugin that tallies test outcomes as reports come in."""
+    
+    def __init__(self):
+        self.tests_run = 0
+        self.failures = 0
+        self.errors = 0
+        self.skipped = 0
+    
+    def pytest_runtest_logreport(self, report):
+        if report.when == 'call':
+            self.tests_run += 1
+            if report.failed:
+                self.failures += 1
+            elif report.skipped:
+                self.skipped += 1
+        elif report.when == 'setup' and not report.passed:
+            # The test body never ran - a skip marker or a fixture error
+            self.tests_run += 1
+            if report.skipped:
+                self.skipped += 1
+            else:
+                self.errors += 1
+        elif report.failed:
+            # Teardown error after the test itself was counted
+            self.errors += 1
+    
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self.errors += 1
+
 
 class TestRunner:
     """Enhanced test runner with comprehensive reporting and analysis."""
     
+    # System info and environment validation happen once per process,
+    # however many runners or runs there are
+    _system_info_printed = False
+    _validated = False
+    
     def __init__(self, test_dir=None, coverage=True, performance=True, verbose=True):
-        self.test_dir = test_dir or project_root / 'tests'
+        self.test_dir = test_dir or _project_root() / 'tests'
         self.coverage_enabled = coverage
         self.performance_enabled = performance
         self.verbose = verbose
@@ -62,7 +260,7 @@ class TestRunner:
         # Run test categories
         for pattern_name in patterns:
             if pattern_name in TEST_PATTERNS:
-                self._run_test_category(pattern_name, TEST_PATTERNS[pattern_name])
+                self._run_test_category(pattern_name, TEST_PATTERNS[pattern_name], parallel)
             else:
                 print(f"⚠️  Unknown test pattern: {pattern_name}")
         
@@ -73,19 +271,22 @@ class TestRunner:
     
     def _print_system_info(self):
         """Print system information for test context."""
+        if TestRunner._system_info_printed:
+            return
+        TestRunner._system_info_printed = True
+        
         print("\n📋 System Information:")
-        print(f"   Python: {sys.version.split()[0]}")
+        print(f"   Python: {_PY_VERSION}")
         print(f"   Platform: {sys.platform}")
         print(f"   Test Directory: {self.test_dir}")
-        print(f"   Project Root: {project_root}")
+        print(f"   Project Root: {_project_root()}")
         
         # Check Cygwin environment
         try:
-            from psutil_cygwin.cygwin_check import is_cygwin
-            is_cygwin_env = is_cygwin()
+            is_cygwin_env = _cached_is_cygwin()
             print(f"   Cygwin Environment: {'✅ Yes' if is_cygwin_env else '❌ No'}")
             
-            if os.path.exists('/proc'):
+            if _HAS_PROC:
                 print(f"   /proc filesystem: ✅ Available")
             else:
                 print(f"   /proc filesystem: ❌ Not available")
@@ -97,6 +298,9 @@ class TestRunner:
     
     def _validate_environment(self):
         """Validate test environment setup."""
+        if TestRunner._validated:
+            return True
+        
         print("🔍 Environment Validation:")
         
         # Check test directory
@@ -115,93 +319,205 @@ class TestRunner:
             return False
         
         print()
+        TestRunner._validated = True
         return True
     
-    def _run_test_category(self, category_name, pattern):
+    def _run_test_category(self, category_name, pattern, parallel=False):
         """Run a specific test category with detailed reporting."""
         print(f"\n🧪 Running {category_name.upper()} Tests ({pattern})")
         print("-" * 50)
         
         # Discover tests
-        test_files = list(self.test_dir.glob(pattern))
+        names = fnmatch.filter(_scan_tests(self.test_dir), pattern)
+        test_files = [self.test_dir / name for name in names]
         if not test_files:
             print(f"⚠️  No test files found for pattern: {pattern}")
-            self.results[category_name] = {'status': 'skipped', 'reason': 'no_files'}
+            self.results[category_name] = _category_result('skipped', reason='no_files')
             return
         
         print(f"📁 Found {len(test_files)} test file(s): {[f.name for f in test_files]}")
         
         # Run tests
         category_start = time.time()
-        result = self._run_tests_basic(test_files, category_name)
+        result = self._run_tests_basic(test_files, category_name, _resolve_jobs(parallel))
         category_end = time.time()
         
         # Store results
-        result['duration'] = category_end - category_start
-        result['files'] = [f.name for f in test_files]
+        result = _category_result('completed', duration=category_end - category_start,
+                                  files=[f.name for f in test_files], **result)
         self.results[category_name] = result
         
         # Summary
         self._print_category_summary(category_name, result)
     
-    def _run_tests_basic(self, test_files, category_name):
-        """Run tests using basic unittest runner."""
-        # Try to run each test file individually
+    def _run_tests_basic(self, test_files, category_name, jobs=1):
+        """Run a category's test files, in-process unless it needs isolation."""
+        if category_name in ISOLATED_CATEGORIES:
+            return self._run_tests_isolated(test_files, jobs)
+        if pytest is None:
+            return self._run_tests_unittest(TEST_PATTERNS[category_name])
+        return self._run_tests_pytest(test_files, jobs)
+    
+    def _run_tests_unittest(self, pattern):
+        """Discover and run the category's files in one unittest run."""
+        import unittest
+        from io import StringIO
+        from tests._caches import reset_caches
+        
+        class ResettingResult(unittest.TextTestResult):
+            # Same per-test cache reset conftest.py sets up under pytest
+            def startTest(self, test):
+                reset_caches()
+                super().startTest(test)
+        
+        loader = unittest.TestLoader()
+        suite = loader.discover(str(self.test_dir), pattern=pattern,
+                                top_level_dir=str(_project_root()))
+        stream = StringIO()
+        runner = unittest.TextTestRunner(stream=stream, verbosity=2 if self.verbose else 1,
+                                         resultclass=ResettingResult)
+        result = runner.run(suite)
+        
+        if not result.wasSuccessful():
+            print(stream.getvalue())
+        
+        return {
+            'success': result.wasSuccessful(),
+            'tests_run': result.testsRun,
+            'failures': len(result.failures),
+            'errors': len(result.errors),
+            'skipped': len(result.skipped),
+        }
+    
+    def _run_tests_pytest(self, test_files, jobs=1):
+        """Run all test files in a single in-process pytest session."""
+        collector = _ResultCollector()
+        args = [str(f) for f in test_files] + (['-v'] if self.verbose else ['-q'])
+        if jobs > 1 and HAS_XDIST:
+            args += ['-n', str(jobs)]
+        
+        try:
+            exit_code = pytest.main(args, plugins=[collector])
+        except Exception as e:
+            print(f"   💥 Error running pytest: {e}")
+            collector.errors += 1
+            exit_code = -1
+        
+        return {
+            'success': exit_code == 0,
+            'tests_run': collector.tests_run,
+            'failures': collector.failures,
+            'errors': collector.errors,
+            'skipped': collector.skipped,
+        }
+    
+    def _run_tests_isolated(self, test_files, jobs=1):
+        """Run each test file as a script in its own interpreter."""
         total_tests = 0
         total_failures = 0
         total_errors = 0
         total_skipped = 0
-        all_success = True
+        
+        # Test files rely on conftest.py for sys.path under pytest; as
+        # plain scripts they need the project root on PYTHONPATH
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            filter(None, [str(_project_root()), env.get('PYTHONPATH')]))
         
         for test_file in test_files:
-            try:
-                print(f"   Running {test_file.name}...")
+            print(f"   Running {test_file.name}...")
+        
+        # Each file is its own subprocess, so threads are enough to overlap
+        # them; all of them share one deadline instead of a timeout each
+        deadline = time.monotonic() + CATEGORY_TIMEOUT
+        with ThreadPoolExecutor(max_workers=min(jobs, len(test_files))) as executor:
+            futures = [executor.submit(self._run_single_file, f, env, deadline)
+                       for f in test_files]
+            for future in as_completed(futures):
+                name, outcome, stdout_tail, stderr_tail = future.result()
                 
-                # Run the test file as a script
-                result = subprocess.run([
-                    sys.executable, str(test_file)
-                ], cwd=str(project_root), capture_output=True, text=True, timeout=300)
+                # Count the tests the script reports, as in-process runs do
+                counts = None
+                if outcome in ('passed', 'failed'):
+                    counts = _parse_test_summary(stdout_tail + '\n' + stderr_tail)
+                if counts:
+                    total_tests += counts['tests_run']
+                    total_failures += counts['failures']
+                    total_errors += counts['errors']
+                    total_skipped += counts['skipped']
                 
-                if result.returncode == 0:
-                    print(f"   ✅ {test_file.name} passed")
+                if outcome == 'passed':
+                    print(f"   ✅ {name} passed")
+                elif outcome == 'failed':
+                    print(f"   ❌ {name} failed")
+                    print(f"      stdout:\n{stdout_tail}")
+                    print(f"      stderr:\n{stderr_tail}")
+                    if not (counts and (counts['failures'] or counts['errors'])):
+                        # The script failed without a failing test to show for it
+                        total_errors += 1
+                elif outcome == 'timeout':
+                    print(f"   ⏰ {name} timed out")
+                    total_errors += 1
                 else:
-                    print(f"   ❌ {test_file.name} failed")
-                    print(f"      stdout: {result.stdout[-200:]}")  # Last 200 chars
-                    print(f"      stderr: {result.stderr[-200:]}")  # Last 200 chars
-                    all_success = False
-                    total_failures += 1
-                
-                total_tests += 1
-                
-            except subprocess.TimeoutExpired:
-                print(f"   ⏰ {test_file.name} timed out")
-                total_errors += 1
-                all_success = False
-            except Exception as e:
-                print(f"   💥 Error running {test_file.name}: {e}")
-                total_errors += 1
-                all_success = False
+                    print(f"   💥 Error running {name}: {stderr_tail}")
+                    total_errors += 1
         
         return {
-            'success': all_success,
+            'success': total_failures == 0 and total_errors == 0,
             'tests_run': total_tests,
             'failures': total_failures,
             'errors': total_errors,
             'skipped': total_skipped,
         }
     
+    @staticmethod
+    def _run_single_file(test_file, env, deadline):
+        """Run one test file; returns (name, outcome, stdout_tail, stderr_tail)."""
+        import subprocess
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # Category budget spent before this file got a worker
+            return test_file.name, 'timeout', '', ''
+        try:
+            returncode, stdout_tail, stderr_tail = _run_streaming(
+                [sys.executable, str(test_file)], cwd=str(_project_root()),
+                timeout=remaining, env=env)
+        except subprocess.TimeoutExpired:
+            return test_file.name, 'timeout', '', ''
+        except Exception as e:
+            return test_file.name, 'error', '', str(e)
+        
+        outcome = 'passed' if returncode == 0 else 'failed'
+        return test_file.name, outcome, stdout_tail, stderr_tail
+    
     def _print_category_summary(self, category_name, result):
         """Print summary for test category."""
         if result.get('success', False):
             print(f"\n✅ {category_name.upper()} TESTS PASSED")
-            print(f"   Test files run: {result.get('tests_run', 0)}")
+            print(f"   Tests run: {result.get('tests_run', 0)}")
             print(f"   Duration: {result.get('duration', 0):.2f}s")
         else:
             print(f"\n❌ {category_name.upper()} TESTS FAILED")
-            print(f"   Test files run: {result.get('tests_run', 0)}")
+            print(f"   Tests run: {result.get('tests_run', 0)}")
             print(f"   Failures: {result.get('failures', 0)}")
             print(f"   Errors: {result.get('errors', 0)}")
     
+    def _aggregate_results(self):
+        """
+        Totals over all category results in one pass.
+        
+        Returns (tests_run, failures, errors, successful_categories,
+        total_categories).
+        """
+        tests_run = failures = errors = successful = 0
+        for r in self.results.values():
+            tests_run += r['tests_run']
+            failures += r['failures']
+            errors += r['errors']
+            successful += r['success']
+        return tests_run, failures, errors, successful, len(self.results)
+    
     def _generate_final_report(self):
         """Generate comprehensive final report."""
         total_duration = time.time() - self.start_time
@@ -211,18 +527,13 @@ class TestRunner:
         print("=" * 80)
         
         # Overall statistics
-        total_test_files = sum(r.get('tests_run', 0) for r in self.results.values() if isinstance(r, dict))
-        total_failures = sum(r.get('failures', 0) for r in self.results.values() if isinstance(r, dict))
-        total_errors = sum(r.get('errors', 0) for r in self.results.values() if isinstance(r, dict))
-        
-        successful_categories = sum(1 for r in self.results.values() 
-                                  if isinstance(r, dict) and r.get('success', False))
-        total_categories = len([r for r in self.results.values() if isinstance(r, dict)])
+        (total_tests, total_failures, total_errors,
+         successful_categories, total_categories) = self._aggregate_results()
         
         print(f"\n📊 Overall Statistics:")
         print(f"   Total test categories: {total_categories}")
         print(f"   Successful categories: {successful_categories}")
-        print(f"   Total test files run: {total_test_files}")
+        print(f"   Total tests run: {total_tests}")
         print(f"   Total failures: {total_failures}")
         print(f"   Total errors: {total_errors}")
         print(f"   Total duration: {total_duration:.2f}s")
@@ -230,13 +541,12 @@ class TestRunner:
         # Category breakdown
         print(f"\n📋 Category Results:")
         for category, result in self.results.items():
-            if isinstance(result, dict):
-                status = "✅ PASS" if result.get('success', False) else "❌ FAIL"
-                duration = result.get('duration', 0)
-                tests = result.get('tests_run', 0)
-                print(f"   {category:20s}: {status} ({tests} files, {duration:.2f}s)")
-            else:
+            if result['status'] == 'skipped':
                 print(f"   {category:20s}: ⚠️  SKIPPED")
+            else:
+                status = "✅ PASS" if result['success'] else "❌ FAIL"
+                print(f"   {category:20s}: {status} "
+                      f"({result['tests_run']} tests, {result['duration']:.2f}s)")
         
         # Final assessment
         overall_success = (total_failures == 0 and total_errors == 0 and 
@@ -257,6 +567,9 @@ class TestRunner:
     
     def _save_detailed_report(self):
         """Save detailed report to JSON file."""
+        from datetime import datetime
+        
+        total_tests, total_failures, total_errors, _, _ = self._aggregate_results()
         report_data = {
             'timestamp': datetime.now().isoformat(),
             'python_version': sys.version,
@@ -264,16 +577,18 @@ class TestRunner:
             'test_results': self.results,
             'summary': {
                 'total_duration': time.time() - self.start_time,
-                'total_test_files': sum(r.get('tests_run', 0) for r in self.results.values() if isinstance(r, dict)),
-                'total_failures': sum(r.get('failures', 0) for r in self.results.values() if isinstance(r, dict)),
-                'total_errors': sum(r.get('errors', 0) for r in self.results.values() if isinstance(r, dict)),
+                'total_tests': total_tests,
+                # Same count under the key earlier reports used
+                'total_test_files': total_tests,
+                'total_failures': total_failures,
+                'total_errors': total_errors,
             }
         }
         
-        report_file = project_root / 'test_report.json'
+        report_file = _project_root() / 'test_report.json'
         try:
-            with open(report_file, 'w') as f:
-                json.dump(report_data, f, indent=2, default=str)
+            with open(report_file, 'wb') as f:
+                f.write(_dumps_report(report_data))
             print(f"📄 Detailed report saved to: {report_file}")
         except Exception as e:
             print(f"⚠️  Could not save detailed report: {e}")
@@ -281,6 +596,8 @@ class TestRunner:
 
 def main():
     """Main entry point for test runner."""
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Comprehensive psutil-cygwin test runner')
     parser.add_argument('--tests', nargs='*', choices=list(TEST_PATTERNS.keys()),
                        help='Specific test categories to run')
@@ -292,6 +609,9 @@ def main():
                        help='Reduce output verbosity')
     parser.add_argument('--test-dir', type=Path,
                        help='Override test directory location')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Parallel workers per category (0 = one per CPU; '
+                            'in-process categories need pytest-xdist)')
     
     args = parser.parse_args()
     
@@ -305,10 +625,11 @@ def main():
     
     # Run tests
     patterns = args.tests or ['unit', 'integration', 'pth', 'stress']
-    results = runner.run_all_tests(patterns=patterns)
+    results = runner.run_all_tests(patterns=patterns,
+                                   parallel=args.jobs if args.jobs > 0 else True)
     
     # Exit with appropriate code
-    all_success = all(r.get('success', False) for r in results.values() if isinstance(r, dict))
+    all_success = all(r['success'] for r in results.values())
     sys.exit(0 if all_success else 1)
 
 
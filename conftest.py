@@ -0,0 +1,29 @@
+"""
+Root pytest configuration for psutil-cygwin.
+
+Makes the in-tree psutil_cygwin package (and the shared tests helpers)
+importable once for the whole session, so individual test modules do not
+need to patch sys.path themselves. An editable install works as well.
+
+Also resets the library's caches before every test so values cached by
+an earlier test never hide mocked /proc data or a patched os.sysconf.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+_ROOT = str(Path(__file__).parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+# Shared with the unittest path of comprehensive_test_runner.py
+from tests._caches import reset_caches
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    """Start every test with empty library caches."""
+    reset_caches()
+    yield
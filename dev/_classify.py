@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Control-flow line classification shared by the line 352 analyzers.
+
+classify_line() runs one precompiled regex over a line and reports both
+which statement it opens (try/except/finally/def/class) and its indent,
+so callers dispatch on a constant instead of chaining strip() and
+startswith()/endswith() checks.
+"""
+
+import re
+
+TRY = 1
+EXCEPT = 2
+FINALLY = 3
+DEF = 4
+CLASS = 5
+
+# Marker label printed by the analyzers for each kind
+LABELS = {TRY: 'TRY', EXCEPT: 'EXCEPT', FINALLY: 'FINALLY', DEF: 'METHOD', CLASS: 'CLASS'}
+
+# Group 1 is the indent; groups 2-5 pick the kind, and a match with none
+# of them is a line ending in "try:"
+_LINE_RE = re.compile(r'([ \t]*)(?:(except)|(finally:)\s*$|(def )|(class )|.*try:\s*$)')
+_KIND_BY_GROUP = (None, TRY, EXCEPT, FINALLY, DEF, CLASS)
+
+
+def classify_line(line: str) -> tuple:
+    """(kind, indent) of ``line``; kind is 0 when it opens none of the blocks."""
+    match = _LINE_RE.match(line)
+    if match is None:
+        return 0, 0
+    return _KIND_BY_GROUP[match.lastindex], match.end(1)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Shared source file cache for the dev analysis scripts.
+
+The issue 011-014 analyzers all inspect the same test file. Reading,
+splitting and parsing go through this module so that, when the scripts
+run in one process, each file is read and parsed once. Entries are keyed
+on the file's mtime, so an edited file is picked up on the next call.
+
+Files are read as bytes and handed to ast.parse() undecoded, letting the
+parser honour the encoding declaration itself; text is decoded only for
+the scripts that print lines.
+"""
+
+import ast
+import os
+from functools import lru_cache
+from pathlib import Path
+
+
+def _key(path):
+    """Cache key for ``path``: the path string and its current mtime."""
+    path = os.fspath(path)
+    return path, os.stat(path).st_mtime_ns
+
+
+@lru_cache(maxsize=8)
+def _read_bytes(path, mtime_ns):
+    return Path(path).read_bytes()
+
+
+@lru_cache(maxsize=8)
+def _read(path, mtime_ns):
+    return _read_bytes(path, mtime_ns).decode('utf-8', errors='replace')
+
+
+@lru_cache(maxsize=8)
+def _split(path, mtime_ns):
+    return tuple(_read(path, mtime_ns).splitlines())
+
+
+@lru_cache(maxsize=8)
+def _parse(path, mtime_ns):
+    return ast.parse(_read_bytes(path, mtime_ns), filename=path)
+
+
+def get_text(path):
+    """Contents of ``path`` as a string."""
+    return _read(*_key(path))
+
+
+def get_lines(path):
+    """Lines of ``path`` without line endings, as a tuple."""
+    return _split(*_key(path))
+
+
+def get_ast(path):
+    """Parsed module AST of ``path``; raises SyntaxError like ast.parse."""
+    return _parse(*_key(path))
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+sys.modules helpers for the dev import-debugging scripts.
+"""
+
+import sys
+
+
+def drop_prefix(prefix):
+    """Forget every imported module whose name starts with ``prefix``.
+    
+    Only the matching keys are removed; sys.modules is never emptied, so
+    the interpreter's own modules stay registered even for a moment.
+    """
+    for name in [n for n in sys.modules if n.startswith(prefix)]:
+        sys.modules.pop(name, None)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Output helpers for the dev diagnostic scripts.
+"""
+
+import contextlib
+import functools
+import io
+import sys
+
+
+def buffered(func):
+    """Collect everything ``func`` prints and write it out in one call.
+    
+    The diagnostics print a report line by line; when stdout is line
+    buffered (a terminal, or a log piped through tee) each print is its
+    own write. The report is still written if ``func`` raises.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        buf = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buf):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buf.getvalue())
+            sys.stdout.flush()
+    return wrapper
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Cached environment probes for the dev scripts.
+
+Cygwin detection stats several paths and the project root is resolved
+through the filesystem; both answers are fixed for the life of a process,
+so each is worked out once and shared by every script that imports it.
+"""
+
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def project_root():
+    """Absolute path of the psutil-cygwin checkout this dev/ belongs to."""
+    return os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+@lru_cache(maxsize=None)
+def is_cygwin():
+    """psutil_cygwin.cygwin_check.is_cygwin(), evaluated once per process.
+    
+    Tests that mock platform.system must call is_cygwin.cache_clear().
+    An ImportError is raised again on each call, since failures are not cached.
+    """
+    from psutil_cygwin.cygwin_check import is_cygwin as _is_cygwin
+    return _is_cygwin()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+site-packages helpers for the dev .pth diagnostic scripts.
+"""
+
+import os
+import site
+
+PTH_NAME = 'psutil.pth'
+
+
+def _compute_site_dirs():
+    """System site-packages plus the user site, without duplicates.
+    
+    On Cygwin the same directory can be reported with a different case,
+    a trailing slash or through a symlink, so entries are compared by
+    their normalized real path; the first spelling of each is kept.
+    """
+    try:
+        dirs = site.getsitepackages() + [site.getusersitepackages()]
+    except Exception:
+        return ()
+    seen = set()
+    unique_dirs = []
+    for directory in dirs:
+        key = os.path.normcase(os.path.realpath(directory))
+        if key not in seen:
+            seen.add(key)
+            unique_dirs.append(directory)
+    return tuple(unique_dirs)
+
+
+# Resolved once at import and shared by every diagnostic in the process
+SITE_DIRS = _compute_site_dirs()
+
+
+def find_pth_files(dirs, name=PTH_NAME):
+    """Yield the path of ``name`` in each of ``dirs`` that contains it.
+    
+    Each directory is listed once with scandir rather than probed with
+    exists() + join() + exists(); a directory that is missing or
+    unreadable simply raises and is skipped.
+    """
+    for directory in dirs:
+        if not directory:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name == name:
+                        yield entry.path
+                        break
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+
+def read_small_bytes(path, limit=4096):
+    """Raw bytes of a small file such as a .pth, in a single read.
+    
+    .pth files are a few lines of ASCII; anything past ``limit`` bytes is
+    not read.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, limit)
+    finally:
+        os.close(fd)
+
+
+def read_small(path, limit=4096):
+    """Text of a small file; stray non-ASCII bytes are replaced, not raised."""
+    return read_small_bytes(path, limit).decode('ascii', 'replace')
@@ -6,10 +6,20 @@ This script will carefully examine the test file to find the exact source
 of the syntax error at line 352.
 """
 
-import ast
+import re
 import sys
 from pathlib import Path
 
+from _classify import DEF, EXCEPT, FINALLY, TRY, classify_line
+from _file_cache import get_ast, get_lines
+
+
+# Bytes that never need reporting: printable ASCII (and DEL), tab, newline
+_PLAIN_BYTES = bytes(range(0x20, 0x80)) + b'\t\n'
+
+# Characters check_encoding_issues() reports, matched in one C-level scan
+_UNUSUAL_CHAR_RE = re.compile(r'[^\t\n\x20-\x7f]')
+
 
 def analyze_syntax_error():
     """Analyze the syntax error in detail."""
@@ -23,39 +33,30 @@ def analyze_syntax_error():
         print(f"❌ Test file not found: {test_file}")
         return False
     
-    # Read the file
+    # Read the file (shared with the other analyzers)
     try:
-        with open(test_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        lines = get_lines(test_file)
     except Exception as e:
         print(f"❌ Error reading file: {e}")
         return False
     
-    # Split into lines
-    lines = content.split('\n')
     print(f"File has {len(lines)} lines")
     
     # Look around line 352
     print(f"\nLines around 352:")
-    for i in range(345, 360):
-        if i < len(lines):
-            line_num = i + 1
-            line = lines[i]
-            marker = "👈 ERROR LINE" if line_num == 352 else ""
-            print(f"{line_num:3d}: '{line}' {marker}")
+    for line_num, line in enumerate(lines[345:360], 346):
+        marker = "👈 ERROR LINE" if line_num == 352 else ""
+        print(f"{line_num:3d}: '{line}' {marker}")
     
     # Find all finally statements
-    finally_lines = []
-    for i, line in enumerate(lines):
-        if line.strip() == 'finally:':
-            finally_lines.append(i + 1)
+    finally_lines = [i for i, line in enumerate(lines, 1) if line.strip() == 'finally:']
     
     if finally_lines:
         print(f"\nFound 'finally:' statements at lines: {finally_lines}")
     
     # Try to parse the file and get specific error details
     try:
-        ast.parse(content)
+        get_ast(test_file)
         print("✅ File parses correctly - no syntax errors found!")
         return True
     except SyntaxError as e:
@@ -72,9 +73,7 @@ def analyze_syntax_error():
             start = max(0, e.lineno - 5)
             end = min(len(lines), e.lineno + 5)
             
-            for i in range(start, end):
-                line_num = i + 1
-                line = lines[i]
+            for line_num, line in enumerate(lines[start:end], start + 1):
                 marker = " --> " if line_num == e.lineno else "     "
                 print(f"{marker}{line_num:3d}: {line}")
         
@@ -93,19 +92,28 @@ def check_encoding_issues():
         # Try reading with different encodings
         encodings = ['utf-8', 'latin-1', 'cp1252']
         
+        data = test_file.read_bytes()
+        
         for encoding in encodings:
             try:
-                with open(test_file, 'r', encoding=encoding) as f:
-                    content = f.read()
+                content = data.decode(encoding)
                 print(f"✅ Successfully read with {encoding}")
                 
-                # Check for unusual characters
-                lines = content.split('\n')
-                for i, line in enumerate(lines):
-                    # Check for non-printable characters
-                    for j, char in enumerate(line):
-                        if ord(char) > 127 or (ord(char) < 32 and char not in ['\t']):
-                            print(f"⚠️  Non-ASCII character at line {i+1}, column {j+1}: {repr(char)}")
+                # Plain ASCII files have nothing to report
+                if not data.translate(None, _PLAIN_BYTES):
+                    break
+                
+                # Check for unusual characters, tracking line starts as we go
+                line_num, line_start, scanned = 1, 0, 0
+                for match in _UNUSUAL_CHAR_RE.finditer(content):
+                    pos = match.start()
+                    newlines = content.count('\n', scanned, pos)
+                    if newlines:
+                        line_num += newlines
+                        line_start = content.rfind('\n', scanned, pos) + 1
+                    scanned = pos
+                    print(f"⚠️  Non-ASCII character at line {line_num}, "
+                          f"column {pos - line_start + 1}: {repr(match.group())}")
                 
                 break
                 
@@ -125,10 +133,7 @@ def try_manual_fix():
     test_file = Path(__file__).parent.parent / "tests" / "test_pth_functionality.py"
     
     try:
-        with open(test_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.split('\n')
+        lines = get_lines(test_file)
         
         # Look for structural issues around line 352
         if len(lines) >= 352:
@@ -137,28 +142,28 @@ def try_manual_fix():
             print(f"Line 352 repr: {repr(problem_line)}")
             
             # Check previous lines for context
-            for i in range(max(0, 345), min(len(lines), 360)):
-                line = lines[i]
-                line_num = i + 1
+            for line_num, line in enumerate(lines[345:360], 346):
+                i = line_num - 1
                 
                 # Look for unmatched blocks
-                if 'try:' in line:
+                kind, _ = classify_line(line)
+                if kind == TRY:
                     print(f"Found 'try:' at line {line_num}")
-                elif 'except' in line:
+                elif kind == EXCEPT:
                     print(f"Found 'except' at line {line_num}")
-                elif 'finally:' in line:
+                elif kind == FINALLY:
                     print(f"Found 'finally:' at line {line_num}")
                     
                     # Check if this finally has a proper try before it
                     # Look backwards for the matching try
                     found_try = False
                     for j in range(i-1, max(0, i-20), -1):
-                        prev_line = lines[j].strip()
-                        if prev_line.endswith('try:'):
+                        prev_kind, _ = classify_line(lines[j])
+                        if prev_kind == TRY:
                             found_try = True
                             print(f"  Matching try: found at line {j+1}")
                             break
-                        elif prev_line.endswith(':') and 'def ' in prev_line:
+                        elif prev_kind == DEF:
                             break  # Hit a method definition
                     
                     if not found_try:
@@ -8,6 +8,9 @@ This script will examine exactly what's at line 352 and identify the orphaned fi
 import sys
 from pathlib import Path
 
+from _classify import FINALLY, LABELS, TRY, classify_line
+from _file_cache import get_lines
+
 
 def analyze_exact_line_352():
     """Analyze the exact content at line 352 and surrounding context."""
@@ -17,9 +20,9 @@ def analyze_exact_line_352():
         print(f"❌ Test file not found: {test_file}")
         return False
     
+    # Read the file (shared with the other analyzers)
     try:
-        with open(test_file, 'r') as f:
-            lines = f.readlines()
+        lines = get_lines(test_file)
     except Exception as e:
         print(f"❌ Error reading file: {e}")
         return False
@@ -34,6 +37,7 @@ def analyze_exact_line_352():
     # Show context around line 352
     start = max(0, 352 - 20)
     end = min(len(lines), 352 + 10)
+    window = lines[start:end]
     
     print(f"\nLines {start+1} to {end}:")
     print("=" * 80)
@@ -41,10 +45,8 @@ def analyze_exact_line_352():
     try_blocks = []
     finally_blocks = []
     
-    for i in range(start, end):
-        line_num = i + 1
-        line = lines[i].rstrip()
-        indent = len(lines[i]) - len(lines[i].lstrip())
+    for line_num, raw_line in enumerate(window, start + 1):
+        line = raw_line.rstrip()
         
         # Mark the error line
         marker = ""
@@ -52,19 +54,13 @@ def analyze_exact_line_352():
             marker = " <<<< ERROR LINE"
         
         # Track control flow statements
-        stripped = line.strip()
-        if stripped.endswith('try:'):
+        kind, indent = classify_line(line)
+        if kind == TRY:
             try_blocks.append((line_num, indent))
-            marker += " [TRY]"
-        elif stripped.startswith('except'):
-            marker += " [EXCEPT]"
-        elif stripped == 'finally:':
+        elif kind == FINALLY:
             finally_blocks.append((line_num, indent))
-            marker += " [FINALLY]"
-        elif stripped.startswith('def '):
-            marker += " [METHOD]"
-        elif stripped.startswith('class '):
-            marker += " [CLASS]"
+        if kind:
+            marker += f" [{LABELS[kind]}]"
         
         print(f"{line_num:3d}: {line}{marker}")
     
@@ -77,15 +73,15 @@ def analyze_exact_line_352():
     
     # Check if line 352 is a finally block
     if len(lines) >= 352:
-        line_352_content = lines[351].strip()  # 0-indexed
+        line_352_full = lines[351]  # 0-indexed
+        line_352_content = line_352_full.strip()
         print(f"\nLine 352 content: '{line_352_content}'")
         
         if line_352_content == 'finally:':
             print("❌ Line 352 is indeed an orphaned 'finally:' block")
             
             # Find the indentation of this finally
-            line_352_full = lines[351]
-            finally_indent = len(line_352_full) - len(line_352_full.lstrip())
+            _, finally_indent = classify_line(line_352_full)
             print(f"Finally block indentation: {finally_indent} spaces")
             
             # Look for matching try blocks
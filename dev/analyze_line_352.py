@@ -6,14 +6,16 @@ Line-by-line analysis of the test file to find line 352.
 import sys
 from pathlib import Path
 
+from _classify import LABELS, classify_line
+from _file_cache import get_lines
+
 
 def analyze_line_352():
     """Analyze the exact content at line 352."""
     test_file = Path(__file__).parent.parent / "tests" / "test_pth_functionality.py"
     
     try:
-        with open(test_file, 'r') as f:
-            lines = f.readlines()
+        lines = get_lines(test_file)
     except Exception as e:
         print(f"Error reading file: {e}")
         return
@@ -25,24 +27,16 @@ def analyze_line_352():
     start = max(0, 352 - 15)
     end = min(len(lines), 352 + 15)
     
-    for i in range(start, end):
-        line_num = i + 1
-        line = lines[i].rstrip()
+    for line_num, raw in enumerate(lines[start:end], start + 1):
+        line = raw.rstrip()
         
         # Mark special lines
         markers = []
         if line_num == 352:
             markers.append("<<< ERROR LINE")
-        if line.strip() == 'finally:':
-            markers.append("FINALLY")
-        if line.strip().endswith('try:'):
-            markers.append("TRY")
-        if line.strip().startswith('except'):
-            markers.append("EXCEPT")
-        if line.strip().startswith('def '):
-            markers.append("METHOD")
-        if line.strip().startswith('class '):
-            markers.append("CLASS")
+        kind, _ = classify_line(line)
+        if kind:
+            markers.append(LABELS[kind])
             
         marker_str = " ".join(markers)
         if marker_str:
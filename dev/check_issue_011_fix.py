@@ -9,28 +9,45 @@ import ast
 import sys
 from pathlib import Path
 
+from _file_cache import get_ast, get_lines, get_text
+
+# try/finally statement nodes (TryStar is Python 3.11+)
+_TRY_NODES = tuple(filter(None, (ast.Try, getattr(ast, 'TryStar', None))))
+
+
+def _finally_lines(tree, lines):
+    """Line numbers of the 'finally:' keywords, located from the parsed tree.
+    
+    The AST has no node for the keyword itself, so each one is found by
+    looking back from the first finally statement to the end of the
+    preceding block - a few lines at most, never the whole file.
+    """
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, _TRY_NODES) and node.finalbody:
+            previous_end = (node.orelse or node.handlers or node.body)[-1].end_lineno
+            for line_num in range(node.finalbody[0].lineno, previous_end, -1):
+                if lines[line_num - 1].lstrip().startswith('finally'):
+                    found.append(line_num)
+                    break
+    return sorted(found)
+
 
 def check_syntax(file_path):
     """Check the syntax of a Python file."""
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Parse the file to check for syntax errors
-        ast.parse(content)
+        # Parse the file to check for syntax errors (shared with the analyzers)
+        tree = get_ast(file_path)
         
-        # Count lines
-        lines = content.split('\n')
+        # Count lines without splitting the text
+        line_count = get_text(file_path).count('\n')
         
         print(f"✅ File syntax is CORRECT")
         print(f"   File: {file_path}")
-        print(f"   Lines: {len(lines)}")
+        print(f"   Lines: {line_count}")
         
         # Check for finally statements (the issue was around line 352)
-        finally_lines = []
-        for i, line in enumerate(lines):
-            if line.strip() == 'finally:':
-                finally_lines.append(i + 1)
+        finally_lines = _finally_lines(tree, get_lines(file_path))
         
         if finally_lines:
             print(f"   'finally:' statements at lines: {finally_lines}")
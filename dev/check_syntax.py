@@ -5,26 +5,32 @@ Check for syntax errors in core.py
 
 import ast
 import sys
+from functools import lru_cache
+from pathlib import Path
+
+CORE_FILE = '/home/phdyex/my-repos/psutil-cygwin/psutil_cygwin/core.py'
+
+
+@lru_cache(maxsize=None)
+def _parse_core():
+    """Read and parse core.py once; returns (tree, code) for both checks"""
+    tree = ast.parse(Path(CORE_FILE).read_bytes(), filename=CORE_FILE)
+    return tree, compile(tree, CORE_FILE, 'exec')
 
 def check_syntax():
     """Check syntax of core.py"""
-    core_file = '/home/phdyex/my-repos/psutil-cygwin/psutil_cygwin/core.py'
-    
     try:
-        with open(core_file, 'r') as f:
-            source = f.read()
-        
         # Try to parse the AST
-        tree = ast.parse(source, filename=core_file)
+        tree, _ = _parse_core()
         print("✓ core.py syntax is valid")
         
-        # Check for User namedtuple definition
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == 'User':
-                        print("✓ User namedtuple assignment found in AST")
-                        return True
+        # User is a module-level namedtuple, so only top-level statements matter
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(
+                    isinstance(target, ast.Name) and target.id == 'User'
+                    for target in node.targets):
+                print("✓ User namedtuple assignment found in AST")
+                return True
         
         print("✗ User namedtuple assignment NOT found in AST")
         return False
@@ -39,17 +45,15 @@ def check_syntax():
 
 def try_exec():
     """Try to execute core.py and capture any runtime errors"""
-    core_file = '/home/phdyex/my-repos/psutil-cygwin/psutil_cygwin/core.py'
-    
     try:
-        with open(core_file, 'r') as f:
-            source = f.read()
+        # Reuse the code object compiled alongside the syntax check
+        _, code = _parse_core()
         
         # Create a namespace to execute in
         namespace = {}
         
         # Execute the code
-        exec(source, namespace)
+        exec(code, namespace)
         
         if 'User' in namespace:
             print(f"✓ User defined successfully: {namespace['User']}")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Shared try/except/finally structure check for issues 012 and 013.
+
+quick_syntax_check.py and find_orphaned_finally.py used to read and parse
+tests/test_pth_functionality.py separately. Both now go through this
+module, which reads and parses a file once per (path, mtime) and reports
+both the syntax check and the try statement structure from that one parse.
+"""
+
+import ast
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+from _probe import project_root
+
+TEST_FILE = Path(project_root()) / "tests" / "test_pth_functionality.py"
+
+# try statement nodes (TryStar is Python 3.11+)
+_TRY_NODES = tuple(filter(None, (ast.Try, getattr(ast, 'TryStar', None))))
+
+# source: raw bytes of the file; line_starts: offset of each line in
+# source; tree: module AST, or None when the file does not parse; error:
+# the SyntaxError in that case, else None
+Parsed = namedtuple('Parsed', 'source line_starts tree error')
+
+
+def _line_starts(src):
+    """Byte offset at which each line of ``src`` starts."""
+    starts = [0]
+    find = src.find
+    pos = find(b'\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = find(b'\n', pos + 1)
+    if starts[-1] == len(src) and len(starts) > 1:
+        starts.pop()  # a final newline does not start another line
+    elif not src:
+        starts.pop()
+    return tuple(starts)
+
+
+@lru_cache(maxsize=8)
+def _parse(path, mtime_ns):
+    src = Path(path).read_bytes()
+    try:
+        return Parsed(src, _line_starts(src), ast.parse(src, filename=path), None)
+    except SyntaxError as e:
+        return Parsed(src, _line_starts(src), None, e)
+
+
+def parse(path):
+    """Parsed contents of ``path``; re-read only when its mtime changes."""
+    path = os.fspath(path)
+    return _parse(path, os.stat(path).st_mtime_ns)
+
+
+def line_window(parsed, first, last):
+    """Lines ``first``..``last`` (1-based, inclusive) of a parsed file.
+    
+    Only the requested slice of the source is decoded; the offset table
+    makes it a direct lookup rather than a split of the whole file.
+    """
+    starts = parsed.line_starts
+    first = max(first, 1)
+    last = min(last, len(starts))
+    if first > last:
+        return []
+    end = starts[last] if last < len(starts) else len(parsed.source)
+    return parsed.source[starts[first - 1]:end].decode('utf-8', 'replace').splitlines()
+
+
+def try_statements(tree):
+    """Try statements of ``tree`` in source order."""
+    nodes = [node for node in ast.walk(tree) if isinstance(node, _TRY_NODES)]
+    return sorted(nodes, key=lambda node: node.lineno)
+
+
+def analyze(path):
+    """(ok, issues) for ``path``: whether its try structure is sound.
+    
+    An orphaned finally - or any other malformed try - cannot parse, so
+    the issues come from the SyntaxError the parser raises.
+    """
+    error = parse(path).error
+    if error is None:
+        return True, []
+    if error.text and error.text.strip() == 'finally:':
+        issue = f"Line {error.lineno}: ORPHANED finally: block (no matching try: at same indent level)"
+    else:
+        issue = f"Line {error.lineno}: {error.msg}"
+    return False, [issue]
+
+
+if __name__ == "__main__":
+    ok, issues = analyze(sys.argv[1] if len(sys.argv) > 1 else TEST_FILE)
+    for issue in issues:
+        print(f"❌ {issue}")
+    print(f"Result: {'PASS' if ok else 'FAIL'}")
+    sys.exit(0 if ok else 1)
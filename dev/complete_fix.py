@@ -11,8 +11,46 @@ This script will:
 
 import os
 import sys
-import shutil
-import subprocess
+
+from _modcache import drop_prefix
+
+# Cache directories removed whole, and compiled files removed one by one
+CACHE_DIRS = {'__pycache__', '.pytest_cache'}
+CACHE_SUFFIXES = ('.pyc', '.pyo')
+
+def _clean_dir(path):
+    """Clean one directory level; returns the subdirectories left to visit"""
+    import shutil
+    
+    subdirs = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in CACHE_DIRS:
+                    print(f"   Removing {entry.path}")
+                    shutil.rmtree(entry.path)
+                else:
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(CACHE_SUFFIXES):
+                os.unlink(entry.path)
+    return subdirs
+
+def clean_caches(root="."):
+    """Remove Python cache files under root in one parallel scandir walk"""
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    
+    # Unlinks are filesystem-latency bound, so many threads overlap well
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4) as pool:
+        pending = {pool.submit(_clean_dir, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    subdirs = future.result()
+                except OSError as e:
+                    print(f"   Warning: Could not clean {e.filename}: {e}")
+                    continue
+                pending.update(pool.submit(_clean_dir, d) for d in subdirs)
 
 def main():
     """Main fix function"""
@@ -26,29 +64,7 @@ def main():
     
     # Step 1: Remove all cache files
     print("\n1. Removing Python cache files...")
-    cache_patterns = [
-        "**/__pycache__",
-        "**/*.pyc", 
-        "**/*.pyo",
-        ".pytest_cache"
-    ]
-    
-    for pattern in cache_patterns:
-        try:
-            if pattern.endswith("__pycache__"):
-                # Remove __pycache__ directories
-                for root, dirs, files in os.walk("."):
-                    if "__pycache__" in dirs:
-                        cache_path = os.path.join(root, "__pycache__")
-                        print(f"   Removing {cache_path}")
-                        shutil.rmtree(cache_path)
-                        dirs.remove("__pycache__")
-            else:
-                # Use find command for files
-                cmd = f"find . -name '{pattern.replace('**/', '')}' -delete"
-                subprocess.run(cmd, shell=True, capture_output=True)
-        except Exception as e:
-            print(f"   Warning: Could not clean {pattern}: {e}")
+    clean_caches(".")
     
     # Step 2: Test core module  
     print("\n2. Testing core module...")
@@ -70,9 +86,7 @@ def main():
     print("\n3. Testing package import...")
     try:
         # Clear any cached modules
-        modules_to_clear = [k for k in sys.modules.keys() if k.startswith('psutil_cygwin')]
-        for mod in modules_to_clear:
-            del sys.modules[mod]
+        drop_prefix('psutil_cygwin')
         
         # Import package
         import psutil_cygwin as psutil
@@ -4,10 +4,14 @@ Simple test to debug the User import issue
 """
 
 import sys
-import os
+
+from _modcache import drop_prefix
+
+PROJECT_ROOT = '/home/phdyex/my-repos/psutil-cygwin'
 
 # Add current directory to path
-sys.path.insert(0, '/home/phdyex/my-repos/psutil-cygwin')
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 print("=" * 50)
 print("Debugging psutil-cygwin User import issue")
@@ -53,9 +57,7 @@ except Exception as e:
 print("\n3. Testing package level import...")
 try:
     # Clear any cached imports
-    modules_to_clear = [k for k in sys.modules.keys() if k.startswith('psutil_cygwin')]
-    for mod in modules_to_clear:
-        del sys.modules[mod]
+    drop_prefix('psutil_cygwin')
     
     import psutil_cygwin
     print(f"   ✓ Package imported: {psutil_cygwin}")
@@ -77,21 +79,24 @@ except Exception as e:
 # Test 4: __init__.py import list
 print("\n4. Checking __init__.py import statement...")
 try:
-    init_file = '/home/phdyex/my-repos/psutil-cygwin/psutil_cygwin/__init__.py'
-    with open(init_file, 'r') as f:
-        content = f.read()
+    import mmap
+    
+    init_file = f'{PROJECT_ROOT}/psutil_cygwin/__init__.py'
+    # Scan the raw bytes in place; only the matched section gets decoded
+    with open(init_file, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+        import_start = content.find(b'from .core import (')
+        import_end = content.find(b')', import_start) if import_start != -1 else -1
+        import_section = content[import_start:import_end + 1] if import_end != -1 else b''
     
     # Find the import statement
-    import_start = content.find('from .core import (')
     if import_start != -1:
-        import_end = content.find(')', import_start)
         if import_end != -1:
-            import_section = content[import_start:import_end + 1]
             print("   Import statement found:")
-            print(f"   {import_section}")
+            print(f"   {import_section.decode('utf-8', errors='replace')}")
             
             # Check if User is in the import list
-            if 'User,' in import_section or 'User\n' in import_section:
+            if b'User,' in import_section or b'User\n' in import_section:
                 print("   ✓ User is in the import list")
             else:
                 print("   ✗ User is NOT in the import list")
@@ -10,13 +10,42 @@ This script investigates:
 
 import os
 import sys
-import site
-from pathlib import Path
+import re
+import contextlib
+
+from _output import buffered
+from _probe import is_cygwin, project_root
+from _site_dirs import SITE_DIRS, find_pth_files, read_small_bytes
 
 # Add the package to the path for testing
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+sys.path.insert(0, project_root())
+
+# Marker of our .pth file, matched against its raw bytes
+_PSUTIL_CYGWIN_RE = re.compile(rb'psutil_cygwin')
+
+
+@contextlib.contextmanager
+def _isolated_psutil_import():
+    """Import psutil afresh inside the block, restoring sys.modules afterwards.
+    
+    A cached psutil that already is psutil_cygwin is kept, so the import is
+    only re-resolved against sys.path when the answer could differ.
+    """
+    saved = {name: sys.modules.get(name) for name in ('psutil', 'psutil_cygwin')}
+    cached = saved['psutil']
+    if cached is not None and getattr(cached, '__name__', None) != 'psutil_cygwin':
+        del sys.modules['psutil']
+    try:
+        yield
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
 
+@buffered
 def check_environment():
     """Check the Cygwin environment."""
     print("=" * 60)
@@ -42,30 +71,29 @@ def check_environment():
     
     # Test our is_cygwin function
     try:
-        from psutil_cygwin.cygwin_check import is_cygwin
         cygwin_detected = is_cygwin()
         print(f"is_cygwin() result: {cygwin_detected}")
     except Exception as e:
         print(f"Error checking is_cygwin(): {e}")
 
 
-def check_pth_file_status():
-    """Check if psutil.pth file exists and is configured correctly."""
+@buffered
+def check_pth_file_status(verbose=False):
+    """Check if psutil.pth file exists and is configured correctly.
+    
+    The scan stops at the first psutil.pth that is ours; with ``verbose``
+    every site-packages directory is still reported.
+    """
     print("\n" + "=" * 60)
     print("PTH FILE STATUS CHECK")
     print("=" * 60)
     
-    # Get site-packages directories
-    try:
-        site_packages_dirs = site.getsitepackages()
-        user_site = site.getusersitepackages()
-        all_site_dirs = site_packages_dirs + [user_site]
-    except Exception as e:
-        print(f"Error getting site-packages directories: {e}")
+    if not SITE_DIRS:
+        print("Error getting site-packages directories")
         return False
     
     print("Site-packages directories:")
-    for sp_dir in all_site_dirs:
+    for sp_dir in SITE_DIRS:
         print(f"  {sp_dir}")
         if sp_dir and os.path.exists(sp_dir):
             print(f"    Exists: Yes, Writable: {os.access(sp_dir, os.W_OK)}")
@@ -74,28 +102,24 @@ def check_pth_file_status():
     
     # Check for psutil.pth file
     pth_found = False
-    for sp_dir in all_site_dirs:
-        if not sp_dir or not os.path.exists(sp_dir):
-            continue
-            
-        pth_file = os.path.join(sp_dir, 'psutil.pth')
-        if os.path.exists(pth_file):
-            pth_found = True
-            print(f"\n✅ Found psutil.pth: {pth_file}")
+    for pth_file in find_pth_files(SITE_DIRS):
+        pth_found = True
+        print(f"\n✅ Found psutil.pth: {pth_file}")
+        
+        try:
+            raw = read_small_bytes(pth_file)
+            print(f"Content:\n{raw.decode('ascii', 'replace')}")
             
-            try:
-                with open(pth_file, 'r') as f:
-                    content = f.read()
-                print(f"Content:\n{content}")
+            # Check if it's our file
+            if _PSUTIL_CYGWIN_RE.search(raw):
+                print("✅ This is our psutil-cygwin .pth file")
+                if not verbose:
+                    break
+            else:
+                print("⚠️  This is not our psutil-cygwin .pth file")
                 
-                # Check if it's our file
-                if 'psutil_cygwin' in content:
-                    print("✅ This is our psutil-cygwin .pth file")
-                else:
-                    print("⚠️  This is not our psutil-cygwin .pth file")
-                    
-            except Exception as e:
-                print(f"Error reading .pth file: {e}")
+        except Exception as e:
+            print(f"Error reading .pth file: {e}")
     
     if not pth_found:
         print("❌ No psutil.pth file found")
@@ -105,70 +129,66 @@ def check_pth_file_status():
     return pth_found
 
 
+@buffered
 def check_psutil_import():
     """Check what happens when we import psutil."""
     print("\n" + "=" * 60)
     print("PSUTIL IMPORT CHECK")
     print("=" * 60)
     
-    # Clean slate
-    if 'psutil' in sys.modules:
-        del sys.modules['psutil']
-    
-    # First, check if psutil_cygwin is available
-    try:
-        import psutil_cygwin
-        print("✅ psutil_cygwin is available")
-        print(f"   Module: {psutil_cygwin}")
-        print(f"   File: {getattr(psutil_cygwin, '__file__', 'Unknown')}")
-    except ImportError as e:
-        print(f"❌ psutil_cygwin not available: {e}")
-        print("   Package may not be installed in development mode")
-        return False
-    
-    # Now try importing psutil
-    try:
-        import psutil
-        print("✅ psutil import successful")
-        print(f"   Module name: {getattr(psutil, '__name__', 'Unknown')}")
-        print(f"   Module: {psutil}")
-        print(f"   File: {getattr(psutil, '__file__', 'Unknown')}")
+    # Clean slate for this check only; sys.modules is restored afterwards
+    with _isolated_psutil_import():
+        # First, check if psutil_cygwin is available
+        try:
+            import psutil_cygwin
+            print("✅ psutil_cygwin is available")
+            print(f"   Module: {psutil_cygwin}")
+            print(f"   File: {getattr(psutil_cygwin, '__file__', 'Unknown')}")
+        except ImportError as e:
+            print(f"❌ psutil_cygwin not available: {e}")
+            print("   Package may not be installed in development mode")
+            return False
         
-        # Check if it's our psutil_cygwin
-        if hasattr(psutil, '__name__') and psutil.__name__ == 'psutil_cygwin':
-            print("✅ SUCCESS: Transparent import is working!")
-            print("   'import psutil' is using psutil_cygwin")
+        # Now try importing psutil
+        try:
+            import psutil
+            print("✅ psutil import successful")
+            print(f"   Module name: {getattr(psutil, '__name__', 'Unknown')}")
+            print(f"   Module: {psutil}")
+            print(f"   File: {getattr(psutil, '__file__', 'Unknown')}")
             
-            # Test basic functionality
-            try:
-                cpu_count = psutil.cpu_count()
-                print(f"   Basic test - CPU count: {cpu_count}")
-                return True
-            except Exception as e:
-                print(f"   ⚠️  Basic functionality test failed: {e}")
+            # Check if it's our psutil_cygwin
+            if hasattr(psutil, '__name__') and psutil.__name__ == 'psutil_cygwin':
+                print("✅ SUCCESS: Transparent import is working!")
+                print("   'import psutil' is using psutil_cygwin")
+                
+                # Test basic functionality
+                try:
+                    cpu_count = psutil.cpu_count()
+                    print(f"   Basic test - CPU count: {cpu_count}")
+                    return True
+                except Exception as e:
+                    print(f"   ⚠️  Basic functionality test failed: {e}")
+                    return False
+                    
+            else:
+                print("⚠️  Standard psutil detected, not psutil-cygwin")
+                print("   Transparent import is not active")
                 return False
                 
-        else:
-            print("⚠️  Standard psutil detected, not psutil-cygwin")
-            print("   Transparent import is not active")
+        except ImportError as e:
+            print(f"❌ psutil import failed: {e}")
+            print("   No psutil available (standard or psutil-cygwin)")
             return False
-            
-    except ImportError as e:
-        print(f"❌ psutil import failed: {e}")
-        print("   No psutil available (standard or psutil-cygwin)")
-        return False
 
 
-def suggest_solutions():
-    """Suggest solutions for the identified issues."""
+@buffered
+def suggest_solutions(pth_exists, import_works):
+    """Suggest solutions from the results of the pth and import checks."""
     print("\n" + "=" * 60)
     print("SUGGESTED SOLUTIONS")
     print("=" * 60)
     
-    # Check current state
-    pth_exists = check_pth_file_status()
-    import_works = check_psutil_import()
-    
     if not pth_exists:
         print("\n🔧 To fix transparent import:")
         print("1. pip install -e .  # Install in development mode")
@@ -188,16 +208,16 @@ def suggest_solutions():
         print("Updated test should now work correctly.")
 
 
-def main():
+def main(verbose=False):
     """Run all diagnostic checks."""
     print("Diagnosing Issue 010: Why tests are skipped on Cygwin")
     print("This script will help understand the transparent import setup.")
     
     try:
         check_environment()
-        check_pth_file_status()
-        check_psutil_import()
-        suggest_solutions()
+        pth_exists = check_pth_file_status(verbose)
+        import_works = check_psutil_import()
+        suggest_solutions(pth_exists, import_works)
         
         print("\n" + "=" * 60)
         print("DIAGNOSIS COMPLETE")
@@ -216,4 +236,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(verbose='--verbose' in sys.argv[1:])
@@ -8,10 +8,12 @@ This script helps identify and resolve the ModuleNotFoundError with psutil.pth.
 import os
 import sys
 import site
-import tempfile
-from pathlib import Path
 
+from _output import buffered
+from _site_dirs import SITE_DIRS, find_pth_files, read_small
 
+
+@buffered
 def diagnose_pth_issue():
     """Diagnose the .pth file issue and provide solutions."""
     print("=" * 60)
@@ -23,36 +25,18 @@ def diagnose_pth_issue():
     print(f"   Python executable: {sys.executable}")
     
     print("\n2. CHECKING SITE-PACKAGES DIRECTORIES:")
-    try:
-        site_dirs = site.getsitepackages()
-        print(f"   System site-packages: {site_dirs}")
-    except:
-        print("   Could not get system site-packages")
-        site_dirs = []
-    
-    try:
-        user_site = site.getusersitepackages()
-        print(f"   User site-packages: {user_site}")
-    except:
-        print("   Could not get user site-packages")
-        user_site = None
+    if SITE_DIRS:
+        print(f"   Site-packages directories: {list(SITE_DIRS)}")
+    else:
+        print("   Could not get site-packages directories")
     
     print("\n3. LOOKING FOR EXISTING psutil.pth FILES:")
     pth_files_found = []
     
-    # Check system site-packages
-    for site_dir in site_dirs:
-        pth_path = os.path.join(site_dir, 'psutil.pth')
-        if os.path.exists(pth_path):
-            pth_files_found.append(pth_path)
-            print(f"   Found: {pth_path}")
-    
-    # Check user site-packages
-    if user_site:
-        user_pth = os.path.join(user_site, 'psutil.pth')
-        if os.path.exists(user_pth):
-            pth_files_found.append(user_pth)
-            print(f"   Found: {user_pth}")
+    # Check system and user site-packages
+    for pth_path in find_pth_files(SITE_DIRS):
+        pth_files_found.append(pth_path)
+        print(f"   Found: {pth_path}")
     
     if not pth_files_found:
         print("   No psutil.pth files found")
@@ -70,9 +54,8 @@ def diagnose_pth_issue():
     for pth_file in pth_files_found:
         try:
             print(f"\n   Contents of {pth_file}:")
-            with open(pth_file, 'r') as f:
-                content = f.read()
-            for i, line in enumerate(content.split('\n'), 1):
+            content = read_small(pth_file)
+            for i, line in enumerate(content.splitlines(), 1):
                 if line.strip():
                     print(f"   Line {i}: {line}")
                     if i == 3:  # The problematic line 3
@@ -85,6 +68,7 @@ def diagnose_pth_issue():
     return pth_files_found, module_available
 
 
+@buffered
 def suggest_solutions(pth_files_found, module_available):
     """Suggest solutions based on the diagnosis."""
     print("\n" + "=" * 60)
@@ -117,39 +101,61 @@ def suggest_solutions(pth_files_found, module_available):
     print("   python -c \"from psutil_cygwin._build.hooks import remove_psutil_pth; remove_psutil_pth()\"")
 
 
-def attempt_cleanup():
-    """Attempt to clean up the problematic .pth files."""
+@buffered
+def attempt_cleanup(pth_files_found=()):
+    """Attempt to clean up the problematic .pth files.
+    
+    Returns whether the cleanup ran, plus the site directories that held
+    one of ``pth_files_found`` and so need re-checking by verify_fix().
+    """
     print("\n" + "=" * 60)
     print("ATTEMPTING AUTOMATIC CLEANUP")
     print("=" * 60)
     
+    touched_dirs = list(dict.fromkeys(os.path.dirname(p) for p in pth_files_found))
     try:
         from psutil_cygwin._build.hooks import remove_psutil_pth
         print("\n🧹 Using psutil_cygwin cleanup function...")
         remove_psutil_pth()
         print("✅ Cleanup function executed successfully")
-        return True
+        return True, touched_dirs
     except Exception as e:
         print(f"❌ Cleanup function failed: {e}")
-        return False
+        return False, touched_dirs
 
 
-def verify_fix():
-    """Verify that the issue has been resolved."""
+@buffered
+def verify_fix(site_dirs=None):
+    """Verify that the issue has been resolved.
+    
+    Only the .pth files in ``site_dirs`` are processed again, through
+    site.addsitedir(). Reloading the whole site module is kept as a fallback
+    for when the affected directories are unknown.
+    """
     print("\n" + "=" * 60)
     print("VERIFYING FIX")
     print("=" * 60)
     
     print("\n🧪 Testing .pth file processing...")
-    try:
-        # Try to reload site module to reprocess .pth files
-        import importlib
-        importlib.reload(site)
-        print("✅ Site module reloaded successfully - no .pth errors")
-        return True
-    except Exception as e:
-        print(f"❌ Site reload failed: {e}")
-        return False
+    if not site_dirs:
+        try:
+            # Try to reload site module to reprocess .pth files
+            import importlib
+            importlib.reload(site)
+            print("✅ Site module reloaded successfully - no .pth errors")
+            return True
+        except Exception as e:
+            print(f"❌ Site reload failed: {e}")
+            return False
+    
+    for site_dir in site_dirs:
+        try:
+            site.addsitedir(site_dir)
+        except Exception as e:
+            print(f"❌ Reprocessing {site_dir} failed: {e}")
+            return False
+    print("✅ Site directories reprocessed successfully - no .pth errors")
+    return True
 
 
 def main():
@@ -163,10 +169,10 @@ def main():
     suggest_solutions(pth_files_found, module_available)
     
     # Step 3: Attempt automatic cleanup
-    cleanup_success = attempt_cleanup()
+    cleanup_success, touched_dirs = attempt_cleanup(pth_files_found)
     
     # Step 4: Verify fix
-    fix_verified = verify_fix()
+    fix_verified = verify_fix(touched_dirs)
     
     print("\n" + "=" * 60)
     print("SUMMARY")
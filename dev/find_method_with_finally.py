@@ -3,56 +3,61 @@
 Find the exact method with the orphaned finally block that needs the try: fix.
 """
 
+import os
 import sys
-from pathlib import Path
+from itertools import islice
 
+from _classify import DEF, classify_line
+from _output import buffered
+from _probe import project_root
 
+
+@buffered
 def find_method_with_orphaned_finally():
     """Find which method has the orphaned finally block at line 352."""
-    test_file = Path(__file__).parent.parent / "tests" / "test_pth_functionality.py"
+    test_file = os.path.join(project_root(), "tests", "test_pth_functionality.py")
+    
+    print(f"Looking for the method containing line 352...")
+    
+    # Stream the file, keeping only the lines of the current method
+    method_start = None
+    current_method = None
+    method_lines = []
+    line_num = 0
     
     try:
         with open(test_file, 'r') as f:
-            lines = f.readlines()
+            for line_num, line in enumerate(f, 1):
+                # Track method definitions
+                if classify_line(line)[0] == DEF:
+                    method_start = line_num
+                    current_method = line.strip()
+                    method_lines = []
+                method_lines.append(line.rstrip())
+                
+                # Line 352 found: read the few lines after it and stop
+                if line_num == 352:
+                    stripped = line.strip()
+                    method_lines.extend(next_line.rstrip() for next_line in islice(f, 5))
+                    break
+            else:
+                print(f"File only has {line_num} lines, but the error is at line 352")
+                return
     except Exception as e:
         print(f"Error reading file: {e}")
         return
     
-    print(f"File has {len(lines)} lines")
-    print(f"Looking for the method containing line 352...")
-    
-    # Find the method containing line 352
-    method_start = None
-    current_method = None
+    first_line = method_start or 1
+    print(f"\nLine 352 (the error): '{stripped}'")
+    print(f"Current method: {current_method}")
+    print(f"Method started at line: {method_start}")
     
-    for i, line in enumerate(lines):
-        line_num = i + 1
-        stripped = line.strip()
-        
-        # Track method definitions
-        if stripped.startswith('def '):
-            method_start = line_num
-            current_method = stripped
-            
-        # When we hit line 352, show the context
-        if line_num == 352:
-            print(f"\nLine 352 (the error): '{stripped}'")
-            print(f"Current method: {current_method}")
-            print(f"Method started at line: {method_start}")
-            
-            # Show the full method context
-            print(f"\nMethod context (lines {method_start}-{line_num+5}):")
-            start = max(0, method_start - 1)  # 0-indexed
-            end = min(len(lines), line_num + 5)
-            
-            for j in range(start, end):
-                context_line_num = j + 1
-                context_line = lines[j].rstrip()
-                marker = " <-- ERROR" if context_line_num == 352 else ""
-                method_marker = " <-- METHOD START" if context_line_num == method_start else ""
-                print(f"{context_line_num:3d}: {context_line}{marker}{method_marker}")
-            
-            break
+    # Show the full method context
+    print(f"\nMethod context (lines {first_line}-{first_line + len(method_lines) - 1}):")
+    for context_line_num, context_line in enumerate(method_lines, first_line):
+        marker = " <-- ERROR" if context_line_num == 352 else ""
+        method_marker = " <-- METHOD START" if context_line_num == method_start else ""
+        print(f"{context_line_num:3d}: {context_line}{marker}{method_marker}")
     
     # Analyze what should be fixed
     print(f"\n" + "="*60)
@@ -6,100 +6,55 @@ This script will locate the specific finally block that's not part of a proper t
 """
 
 import sys
-from pathlib import Path
 
+from _output import buffered
+from check_try_structure import TEST_FILE, analyze, line_window, parse, try_statements
 
+
+@buffered
 def find_orphaned_finally():
     """Find the orphaned finally block causing the syntax error."""
     print("=" * 60)
     print("FINDING ORPHANED FINALLY BLOCK - ISSUE 013")
     print("=" * 60)
     
-    test_file = Path(__file__).parent.parent / "tests" / "test_pth_functionality.py"
-    
     try:
-        with open(test_file, 'r') as f:
-            lines = f.readlines()
+        parsed = parse(TEST_FILE)
     except Exception as e:
         print(f"❌ Error reading file: {e}")
         return False
     
-    print(f"File has {len(lines)} lines")
+    print(f"File has {len(parsed.line_starts)} lines")
     print(f"Error is at line 352")
     
     # Show lines around 352
     print(f"\nContext around line 352:")
-    start_line = max(0, 352 - 10)
-    end_line = min(len(lines), 352 + 10)
+    start_line = max(1, 352 - 9)
+    end_line = 352 + 10
     
-    for i in range(start_line, end_line):
-        line_num = i + 1
-        line = lines[i].rstrip()
+    for line_num, line in enumerate(line_window(parsed, start_line, end_line), start_line):
         indicator = " --> ERROR" if line_num == 352 else ""
-        print(f"{line_num:3d}: {line}{indicator}")
+        print(f"{line_num:3d}: {line.rstrip()}{indicator}")
     
     # Find all try/except/finally blocks
     print(f"\n" + "=" * 60)
     print("ANALYZING TRY/EXCEPT/FINALLY STRUCTURE")
     print("=" * 60)
     
-    block_stack = []
-    issues = []
-    
-    for i, line in enumerate(lines):
-        line_num = i + 1
-        stripped = line.strip()
-        indent = len(line) - len(line.lstrip())
-        
-        # Track try blocks
-        if stripped.endswith('try:'):
-            block_stack.append({
-                'type': 'try',
-                'line': line_num,
-                'indent': indent,
-                'has_except': False,
-                'has_finally': False
-            })
-            print(f"Line {line_num}: Found try: block (indent {indent})")
-        
-        # Track except blocks
-        elif stripped.startswith('except') and stripped.endswith(':'):
-            if block_stack and block_stack[-1]['type'] == 'try':
-                block_stack[-1]['has_except'] = True
-                print(f"Line {line_num}: Found except: block for try at line {block_stack[-1]['line']}")
-            else:
-                issues.append(f"Line {line_num}: except: without matching try:")
-        
-        # Track finally blocks - THIS IS THE KEY CHECK
-        elif stripped == 'finally:':
-            print(f"Line {line_num}: Found finally: block (indent {indent})")
-            
-            # Check if there's a matching try/except structure
-            matching_try = None
-            for block in reversed(block_stack):
-                if block['type'] == 'try' and block['indent'] == indent:
-                    matching_try = block
-                    break
-            
-            if matching_try:
-                matching_try['has_finally'] = True
-                print(f"  ✅ Matches try: at line {matching_try['line']}")
-            else:
-                issues.append(f"Line {line_num}: ORPHANED finally: block (no matching try: at same indent level)")
-                print(f"  ❌ ORPHANED finally: block!")
-                
-                # Show what try blocks are available
-                if block_stack:
-                    print("    Available try blocks:")
-                    for block in block_stack:
-                        print(f"      Line {block['line']}: indent {block['indent']}")
-                else:
-                    print("    No try blocks available")
-        
-        # Close blocks when we hit method/class definitions
-        elif stripped.startswith('def ') or stripped.startswith('class '):
-            # Close any open blocks at this level or deeper
-            block_stack = [b for b in block_stack if b['indent'] < indent]
+    # The parser finds an orphaned finally itself: it is a syntax error
+    ok, issues = analyze(TEST_FILE)
+    if parsed.error is not None:
+        e = parsed.error
+        print(f"❌ File does not parse: line {e.lineno}, column {e.offset}: {e.msg}")
+    else:
+        # Report every try statement with the clauses the parser attached to it
+        for node in try_statements(parsed.tree):
+            print(f"Line {node.lineno}: Found try: block (indent {node.col_offset})")
+            for handler in node.handlers:
+                print(f"Line {handler.lineno}: Found except: block for try at line {node.lineno}")
+            if node.finalbody:
+                print(f"Line {node.finalbody[0].lineno}: finally: body (indent {node.col_offset})")
+                print(f"  ✅ Matches try: at line {node.lineno}")
     
     # Report issues
     print(f"\n" + "=" * 60)
@@ -112,9 +67,10 @@ def find_orphaned_finally():
     else:
         print("✅ No structural issues found")
     
-    return len(issues) == 0
+    return ok
 
 
+@buffered
 def suggest_fix():
     """Suggest how to fix the orphaned finally block."""
     print(f"\n" + "=" * 60)
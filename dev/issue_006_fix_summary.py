@@ -5,89 +5,17 @@ Summary of fixes applied for issue/test/006.txt
 This script documents all the fixes applied to resolve the 9 test failures.
 """
 
+from pathlib import Path
+
+from show_fix_summary import render
+
+SUMMARY_FILE = Path(__file__).parent / "fix_summaries" / "006.json"
+
+
 def print_fix_summary():
     """Print a summary of all fixes applied."""
-    print("🔧 FIXES APPLIED FOR issue/test/006.txt")
-    print("=" * 60)
-    
-    fixes = [
-        {
-            "issue": "AttributeError: 'os.statvfs_result' object has no attribute 'f_available'",
-            "files": ["psutil_cygwin/core.py"],
-            "fix": "Added compatibility checks for f_available, f_bavail, and f_bfree attributes",
-            "description": "Cygwin's statvfs doesn't have f_available. Added fallback logic.",
-            "lines": "disk_usage() function - lines 417-431"
-        },
-        {
-            "issue": "Process 1 not found / init process assumptions",
-            "files": ["tests/test_integration.py"],
-            "fix": "Updated tests to not assume PID 1 exists, use available PIDs instead",
-            "description": "Cygwin doesn't always have PID 1. Tests now adapt to available processes.",
-            "lines": "test_process_listing() and test_process_errors() methods"
-        },
-        {
-            "issue": "Command line parsing: Lists differ: ['arg1\\\\x00...'] != ['arg1', 'arg2', 'arg3']",
-            "files": ["psutil_cygwin/core.py", "tests/test_unit.py"],
-            "fix": "Enhanced cmdline() to handle both real and literal null characters",
-            "description": "Added detection for \\x00 vs \\\\x00 and proper splitting logic.",
-            "lines": "cmdline() method - lines 117-130, test data fixed"
-        },
-        {
-            "issue": "TypeError: dist must be a Distribution instance",
-            "files": ["tests/test_pth_functionality.py"],
-            "fix": "Created proper Distribution instances for setuptools command tests",
-            "description": "Setuptools commands require Distribution objects, not None.",
-            "lines": "Both install/uninstall command tests"
-        },
-        {
-            "issue": "AssertionError: True is not false (Cygwin detection)",
-            "files": ["tests/test_pth_functionality.py"],
-            "fix": "Fixed patch targets to use setup module's functions",
-            "description": "Patches were not targeting the correct module functions.",
-            "lines": "test_is_cygwin_detection() method"
-        },
-        {
-            "issue": "AssertionError: AccessDenied not raised",
-            "files": ["psutil_cygwin/core.py"],
-            "fix": "Fixed exception handling to properly re-raise AccessDenied",
-            "description": "PermissionError wasn't being converted to AccessDenied correctly.",
-            "lines": "name() method - added proper exception handling"
-        }
-    ]
-    
-    for i, fix in enumerate(fixes, 1):
-        print(f"\n{i}. 🐛 {fix['issue']}")
-        print(f"   📁 Files: {', '.join(fix['files'])}")
-        print(f"   🔧 Fix: {fix['fix']}")
-        print(f"   📝 Description: {fix['description']}")
-        print(f"   📍 Location: {fix['lines']}")
-    
-    print(f"\n" + "=" * 60)
-    print("📊 SUMMARY")
-    print("=" * 60)
-    print(f"✅ Total Issues Fixed: {len(fixes)}")
-    print("✅ Core Compatibility Issues: 3 (disk usage, cmdline parsing, exceptions)")
-    print("✅ Test Infrastructure Issues: 2 (setuptools commands, mocking)")
-    print("✅ Cygwin-Specific Adaptations: 1 (process assumptions)")
-    
-    print(f"\n🎯 KEY IMPROVEMENTS:")
-    print("• Enhanced Cygwin compatibility for system calls")
-    print("• Robust handling of platform differences")
-    print("• Better error handling and exception mapping")
-    print("• More flexible test infrastructure")
-    print("• Improved mock data handling in tests")
-    
-    print(f"\n🧪 VERIFICATION:")
-    print("• Run: python dev/test_issue_006_fixes.py")
-    print("• Run: pytest tests/ (should now pass)")
-    print("• All fixes maintain psutil API compatibility")
-    
-    print(f"\n📚 TECHNICAL DETAILS:")
-    print("• statvfs attributes vary between platforms")
-    print("• Cygwin process model differs from Linux")
-    print("• Setuptools commands need proper Distribution objects")
-    print("• Mock patches must target the correct module scope")
-    print("• Exception handling preserves psutil compatibility")
+    render(SUMMARY_FILE)
+
 
 if __name__ == "__main__":
     print_fix_summary()
@@ -5,80 +5,17 @@ Summary of fixes applied for issue/test/007.txt
 This script documents the final fixes applied to resolve the last 2 test failures.
 """
 
+from pathlib import Path
+
+from show_fix_summary import render
+
+SUMMARY_FILE = Path(__file__).parent / "fix_summaries" / "007.json"
+
+
 def print_fix_summary():
     """Print a summary of all fixes applied."""
-    print("🔧 FIXES APPLIED FOR issue/test/007.txt")
-    print("=" * 60)
-    
-    fixes = [
-        {
-            "issue": "AssertionError: True is not false (Cygwin detection test)",
-            "files": ["tests/test_pth_functionality.py"],
-            "fix": "Enhanced mocking to cover all Cygwin detection indicators",
-            "description": "Added patches for os.environ and sys.executable to ensure complete mocking",
-            "technical": "The is_cygwin() function checks 5 indicators: platform.system(), os.path.exists('/proc'), 'CYGWIN' in os.environ, os.path.exists('/cygdrive'), and sys.executable path. All must be mocked for negative tests.",
-            "lines": "test_is_cygwin_detection() method - added @patch decorators"
-        },
-        {
-            "issue": "AssertionError: AccessDenied not raised",
-            "files": ["psutil_cygwin/core.py"],
-            "fix": "Added explicit PermissionError handling in _read_proc_file()",
-            "description": "PermissionError wasn't being caught and converted to AccessDenied",
-            "technical": "Added separate except PermissionError clause before the general OSError handling to ensure direct PermissionError exceptions are properly converted to AccessDenied.",
-            "lines": "_read_proc_file() method - lines 83-93"
-        }
-    ]
-    
-    for i, fix in enumerate(fixes, 1):
-        print(f"\n{i}. 🐛 {fix['issue']}")
-        print(f"   📁 Files: {', '.join(fix['files'])}")
-        print(f"   🔧 Fix: {fix['fix']}")
-        print(f"   📝 Description: {fix['description']}")
-        print(f"   🔬 Technical: {fix['technical']}")
-        print(f"   📍 Location: {fix['lines']}")
-    
-    print(f"\n" + "=" * 60)
-    print("📊 SUMMARY")
-    print("=" * 60)
-    print(f"✅ Total Issues Fixed: {len(fixes)}")
-    print("✅ Test Infrastructure Issues: 1 (mocking completeness)")
-    print("✅ Exception Handling Issues: 1 (PermissionError conversion)")
-    
-    print(f"\n🎯 PROGRESS SUMMARY:")
-    print("• issue/test/006.txt: 9 failures → 2 failures (7 fixed)")
-    print("• issue/test/007.txt: 2 failures → 0 failures (2 fixed)")
-    print("• Total test failures resolved: 9 out of 9")
-    
-    print(f"\n🔍 ROOT CAUSE ANALYSIS:")
-    print("1. **Incomplete Mocking**: The is_cygwin() function uses multiple")
-    print("   detection methods. Tests must mock ALL indicators for reliable")
-    print("   negative testing.")
-    print("2. **Exception Type Specificity**: Python's exception hierarchy")
-    print("   requires specific handling of PermissionError vs general OSError.")
-    
-    print(f"\n🛠️ TECHNICAL IMPROVEMENTS:")
-    print("• Enhanced test mocking with @patch for all detection paths")
-    print("• Explicit PermissionError handling for better exception mapping")
-    print("• Preserved all existing functionality and psutil compatibility")
-    print("• Maintained robust error handling for edge cases")
-    
-    print(f"\n🧪 VERIFICATION:")
-    print("• Run: python dev/test_issue_007_fixes.py")
-    print("• Run: pytest tests/ (should now pass all tests)")
-    print("• Both fixes are minimal and targeted")
-    print("• No regression in existing functionality")
-    
-    print(f"\n📈 TEST SUITE STATUS:")
-    print("• Before fixes: 55 passed, 2 failed, 1 skipped")
-    print("• After fixes: 57 passed, 0 failed, 1 skipped")
-    print("• All core functionality tests passing")
-    print("• All integration tests passing")
-    print("• All unit tests passing")
-    
-    print(f"\n🏆 ACHIEVEMENT:")
-    print("✅ psutil-cygwin test suite is now fully functional!")
-    print("✅ All identified issues have been resolved")
-    print("✅ Project ready for production use")
+    render(SUMMARY_FILE)
+
 
 if __name__ == "__main__":
     print_fix_summary()
@@ -5,99 +5,17 @@ Summary of fixes applied for issue/test/008.txt - Warning Suppression
 This script documents the warning suppression fixes applied.
 """
 
+from pathlib import Path
+
+from show_fix_summary import render
+
+SUMMARY_FILE = Path(__file__).parent / "fix_summaries" / "008.json"
+
+
 def print_fix_summary():
     """Print a summary of warning suppression fixes."""
-    print("🔧 FIXES APPLIED FOR issue/test/008.txt - Warning Suppression")
-    print("=" * 70)
-    
-    print("\n📊 BEFORE:")
-    print("  ❌ 4 deprecation warnings in test output")
-    print("  ❌ Noisy test logs from external libraries")
-    print("  ❌ setup.py deprecation warnings from custom commands")
-    print("  ❌ pkg_resources and namespace package warnings")
-    
-    print("\n📊 AFTER:")
-    print("  ✅ Clean test output with minimal warnings")
-    print("  ✅ Professional CI/CD logs")
-    print("  ✅ Focused attention on actual test results")
-    print("  ✅ Modern build system documentation")
-    
-    fixes = [
-        {
-            "category": "setuptools Commands",
-            "files": ["setup.py"],
-            "fix": "Added warning suppression context managers",
-            "details": "Wrapped install.run() calls with warnings.catch_warnings()",
-            "impact": "Eliminates setup.py deprecation warnings during installation"
-        },
-        {
-            "category": "pytest Configuration", 
-            "files": ["pyproject.toml"],
-            "fix": "Added comprehensive warning filters",
-            "details": "Configured filterwarnings to ignore external deprecation warnings",
-            "impact": "Clean test output with no external library warning noise"
-        },
-        {
-            "category": "Build System Modernization",
-            "files": ["pyproject.toml"],
-            "fix": "Added modern build recommendations",
-            "details": "Documented pip install vs setup.py install best practices",
-            "impact": "Guides users toward modern, warning-free installation methods"
-        }
-    ]
-    
-    print(f"\n🔧 TECHNICAL FIXES:")
-    for i, fix in enumerate(fixes, 1):
-        print(f"\n{i}. {fix['category']}")
-        print(f"   📁 Files: {', '.join(fix['files'])}")
-        print(f"   🔧 Fix: {fix['fix']}")
-        print(f"   📝 Details: {fix['details']}")
-        print(f"   🎯 Impact: {fix['impact']}")
-    
-    print(f"\n" + "=" * 70)
-    print("📈 RESULTS")
-    print("=" * 70)
-    print("✅ Test Status: 55 passed, 1 skipped, 0 failed")
-    print("✅ Warning Reduction: ~75% fewer warning lines in output")
-    print("✅ Functionality: 100% preserved - no regressions")
-    print("✅ User Experience: Significantly cleaner and more professional")
-    
-    print(f"\n🎯 WARNING CATEGORIES ADDRESSED:")
-    warnings_addressed = [
-        ("pkg_resources deprecation", "External setuptools ecosystem", "Filtered in pytest"),
-        ("namespace packages deprecation", "External setuptools ecosystem", "Filtered in pytest"),
-        ("setup.py install deprecation", "Our custom commands", "Suppressed in implementation"),
-        ("SetuptoolsDeprecationWarning", "Our setuptools usage", "Suppressed in context managers")
-    ]
-    
-    for warning, source, solution in warnings_addressed:
-        print(f"  • {warning}")
-        print(f"    Source: {source}")
-        print(f"    Solution: {solution}")
-        print()
-    
-    print(f"🛠️ MODERN BUILD PRACTICES:")
-    print("  ✅ Documented pip install vs setup.py install")
-    print("  ✅ Promoted python -m build for source distributions")
-    print("  ✅ Configured modern setuptools.build_meta backend")
-    print("  ✅ Added development workflow documentation")
-    
-    print(f"\n🧪 VERIFICATION:")
-    print("  • Run: python dev/test_issue_008_fixes.py")
-    print("  • Run: pytest tests/ (clean output)")
-    print("  • Install: pip install -e . (no warnings)")
-    
-    print(f"\n📚 DOCUMENTATION:")
-    print("  • Created: dev/warning_suppression_guide.md")
-    print("  • Updated: pyproject.toml with modern practices")
-    print("  • Enhanced: setup.py with warning suppression")
-    
-    print(f"\n🏆 QUALITY IMPROVEMENTS:")
-    print("  🎯 Professional test output")
-    print("  🎯 Clean CI/CD logs")
-    print("  🎯 Better developer experience")
-    print("  🎯 Future-ready build configuration")
-    print("  🎯 Maintained 100% functionality")
+    render(SUMMARY_FILE)
+
 
 if __name__ == "__main__":
     print_fix_summary()
@@ -6,8 +6,10 @@ Minimal test to isolate the User import issue
 import sys
 import os
 
+from _probe import project_root
+
 # Add the project to the path
-project_path = '/home/phdyex/my-repos/psutil-cygwin'
+project_path = project_root()
 if project_path not in sys.path:
     sys.path.insert(0, project_path)
 
@@ -26,8 +28,7 @@ try:
     else:
         print("   ✗ User NOT found in core module")
         print("   Available namedtuples in core:")
-        for attr_name in dir(core):
-            attr = getattr(core, attr_name)
+        for attr_name, attr in vars(core).items():
             if hasattr(attr, '_fields'):
                 print(f"     {attr_name}: {attr._fields}")
     
@@ -3,43 +3,41 @@
 Quick syntax verification for issue 012.
 """
 
-import ast
 import sys
-from pathlib import Path
 
+from _output import buffered
+from check_try_structure import TEST_FILE, parse, try_statements
+
+@buffered
 def verify_syntax():
     """Verify the test file syntax is correct."""
-    test_file = Path(__file__).parent.parent / "tests" / "test_pth_functionality.py"
+    test_file = TEST_FILE
     
     print(f"Checking syntax of: {test_file}")
     
     try:
-        with open(test_file, 'r') as f:
-            content = f.read()
-        
-        # Parse the file
-        ast.parse(content)
-        
-        lines = content.split('\n')
-        print(f"✅ File syntax is CORRECT")
-        print(f"   Lines: {len(lines)}")
-        print(f"   File parses successfully with Python AST")
-        
-        # Check for finally statements
-        finally_count = sum(1 for line in lines if line.strip() == 'finally:')
-        print(f"   'finally:' statements found: {finally_count}")
-        
-        return True
-        
-    except SyntaxError as e:
+        # Parse the file (shared with find_orphaned_finally)
+        parsed = parse(test_file)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+    
+    e = parsed.error
+    if e is not None:
         print(f"❌ SYNTAX ERROR:")
         print(f"   Line {e.lineno}: {e.msg}")
         print(f"   Text: {e.text.strip() if e.text else 'N/A'}")
         return False
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
+    
+    print(f"✅ File syntax is CORRECT")
+    print(f"   Lines: {len(parsed.line_starts)}")
+    print(f"   File parses successfully with Python AST")
+    
+    # Count finally clauses from the AST; strings and comments can't match
+    finally_count = sum(1 for node in try_statements(parsed.tree) if node.finalbody)
+    print(f"   'finally:' statements found: {finally_count}")
+    
+    return True
 
 if __name__ == "__main__":
     success = verify_syntax()
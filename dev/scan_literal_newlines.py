@@ -6,85 +6,112 @@ This script scans all text files in the project to identify files that
 contain literal \\n characters where actual newlines should be used.
 """
 
+import io
 import os
 import re
-from pathlib import Path
+
+# A literal \n, or a run of one kind of quote together with the backslash
+# escaping its first quote. Counting runs reproduces str.count() on the text
+# before each \n: every quote counts once, minus one if escaped, and a run
+# of n quotes holds n // 3 triple quotes.
+_TOKEN_RE = re.compile(r"""\\n|(\\)?('+|"+)""")
+
+# Code-like fragments that suggest a literal \n should be a real line break,
+# matched anywhere in the line by one search of their alternation
+_CODE_PATTERNS = (
+    'def ', 'class ', 'import ', 'from ', 'if ', 'for ', 'while ',
+    'try:', 'except:', 'finally:', 'with ', 'return ', 'yield '
+)
+_CODE_RE = re.compile('|'.join(map(re.escape, _CODE_PATTERNS)))
+
+def _scan_line(line_num, line):
+    """Problematic literal \\n entries of one line, which contains at least one"""
+    # Walk the line once, keeping running quote counts so that each
+    # literal \n sees the counts of the text before it
+    single_quotes = double_quotes = triple_single = triple_double = 0
+    literal_newlines = []
+    for match in _TOKEN_RE.finditer(line):
+        quotes = match.group(2)
+        if quotes is None:
+            # If we're inside a string literal, it's probably legitimate
+            in_string = (single_quotes % 2 == 1 or double_quotes % 2 == 1
+                         or triple_single % 2 == 1 or triple_double % 2 == 1)
+            literal_newlines.append((match.start(), in_string))
+        elif quotes[0] == "'":
+            single_quotes += len(quotes) - (match.group(1) is not None)
+            triple_single += len(quotes) // 3
+        else:
+            double_quotes += len(quotes) - (match.group(1) is not None)
+            triple_double += len(quotes) // 3
+    
+    # Very long lines with many \n suggest formatting issues
+    is_long = len(literal_newlines) > 5 and len(line) > 200
+    
+    # Lines that look like they should be multiple lines
+    looks_like_code = _CODE_RE.search(line) is not None
+    
+    for nl_pos, in_string in literal_newlines:
+        if is_long or (looks_like_code and not in_string):
+            yield {
+                'line_num': line_num,
+                'position': nl_pos,
+                'content': line.strip()[:100] + ('...' if len(line.strip()) > 100 else ''),
+                'severity': 'high' if len(line) > 300 else 'medium'
+            }
+
+# Bytes read per call while checking a file for a literal \n
+_CHUNK_SIZE = 1 << 16
+
+def _count_lines_without_literal(f):
+    """Line count of the binary file ``f``, or None if it has a literal \\n
+    
+    Most files have no literal \\n at all: reading them in chunks settles
+    them with C-level searches, without decoding or holding the whole file.
+    Lines are counted as str.split('\\n') would after text mode's newline
+    translation.
+    """
+    total_lines = 1
+    last = b''
+    while True:
+        chunk = f.read(_CHUNK_SIZE)
+        if not chunk:
+            return total_lines
+        # The last byte of the previous chunk catches a \n or \r\n split
+        # across the boundary
+        if b'\\n' in chunk or b'\\n' in last + chunk[:1]:
+            return None
+        total_lines += chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b'\r\n')
+        if last == b'\r' and chunk[:1] == b'\n':
+            total_lines -= 1
+        last = chunk[-1:]
 
 def scan_file_for_literal_newlines(file_path):
     """Scan a file for problematic literal \\n characters."""
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        # Split into lines for analysis
-        lines = content.split('\n')
-        
         # Look for literal \n that are NOT inside string literals
         problematic_lines = []
         
-        for line_num, line in enumerate(lines, 1):
-            # Skip empty lines
-            if not line.strip():
-                continue
-                
-            # Find all literal \n occurrences
-            literal_newlines = []
-            pos = 0
-            while True:
-                pos = line.find('\\n', pos)
-                if pos == -1:
-                    break
-                literal_newlines.append(pos)
-                pos += 2
+        with open(file_path, 'rb') as f:
+            total_lines = _count_lines_without_literal(f)
             
-            if not literal_newlines:
-                continue
+            if total_lines is None:
+                # Stream the decoded lines from the start of the file; the
+                # text is never read whole or split into a list
+                f.seek(0)
+                line_num = 0
+                raw_line = ''
+                lines = io.TextIOWrapper(f, encoding='utf-8', errors='ignore')
+                for line_num, raw_line in enumerate(lines, 1):
+                    # Only lines with a literal \n need a closer look
+                    if '\\n' in raw_line:
+                        problematic_lines.extend(_scan_line(line_num, raw_line.rstrip('\n')))
                 
-            # Analyze each occurrence
-            for nl_pos in literal_newlines:
-                # Check if it's inside a string literal
-                before = line[:nl_pos]
-                
-                # Count quotes before the \n
-                single_quotes = before.count("'") - before.count("\\'")
-                double_quotes = before.count('"') - before.count('\\"')
-                
-                # Check for triple quotes
-                triple_single = before.count("'''")
-                triple_double = before.count('"""')
-                
-                # If we're inside a string literal, it's probably legitimate
-                in_single_string = (single_quotes % 2) == 1
-                in_double_string = (double_quotes % 2) == 1
-                in_triple_string = (triple_single % 2) == 1 or (triple_double % 2) == 1
-                
-                # Additional heuristics for problematic \n
-                is_problematic = False
-                
-                # Very long lines with many \n suggest formatting issues
-                if line.count('\\n') > 5 and len(line) > 200:
-                    is_problematic = True
-                
-                # Lines that look like they should be multiple lines
-                if not (in_single_string or in_double_string or in_triple_string):
-                    # Check for code-like patterns with \n
-                    if any(pattern in line for pattern in [
-                        'def ', 'class ', 'import ', 'from ', 'if ', 'for ', 'while ',
-                        'try:', 'except:', 'finally:', 'with ', 'return ', 'yield '
-                    ]):
-                        is_problematic = True
-                
-                if is_problematic:
-                    problematic_lines.append({
-                        'line_num': line_num,
-                        'position': nl_pos,
-                        'content': line.strip()[:100] + ('...' if len(line.strip()) > 100 else ''),
-                        'severity': 'high' if len(line) > 300 else 'medium'
-                    })
+                # Like str.split('\n'), count the empty line after a final newline
+                total_lines = line_num + (not raw_line or raw_line.endswith('\n'))
         
         return {
             'file_path': str(file_path),
-            'total_lines': len(lines),
+            'total_lines': total_lines,
             'problematic_lines': problematic_lines,
             'has_issues': len(problematic_lines) > 0
         }
@@ -96,22 +123,30 @@ def scan_file_for_literal_newlines(file_path):
             'has_issues': False
         }
 
+def scan_files(paths):
+    """Scan ``paths``, yielding one result per file in the order given.
+    
+    Each file is read and analyzed independently, so the files are spread
+    over a pool of worker processes in chunks: the quote counting runs on
+    every core, and one round trip carries several results.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(scan_file_for_literal_newlines, paths, chunksize=chunksize)
+
 def scan_project():
     """Scan the entire project for literal newline issues."""
-    project_root = Path('/home/phdyex/my-repos/psutil-cygwin')
-    
-    # File patterns to scan
-    patterns = [
-        '**/*.py',
-        '**/*.md', 
-        '**/*.rst',
-        '**/*.txt',
-        '**/*.toml',
-        '**/*.yml',
-        '**/*.yaml',
-        '**/*.cfg',
-        '**/*.ini'
-    ]
+    project_root = '/home/phdyex/my-repos/psutil-cygwin'
+    
+    # Paths are kept as strings: a path relative to the project is a slice
+    # past this prefix, with no Path objects built per file
+    root_prefix = os.path.join(project_root, '')
+    
+    # File extensions to scan
+    extensions = ('.py', '.md', '.rst', '.txt', '.toml', '.yml', '.yaml', '.cfg', '.ini')
     
     # Directories to skip
     skip_dirs = {
@@ -119,27 +154,27 @@ def scan_project():
         '.tox', '.coverage', 'node_modules', '.venv', 'venv'
     }
     
-    files_to_scan = set()
+    files_to_scan = []
     
-    # Collect all files matching patterns
-    for pattern in patterns:
-        for file_path in project_root.glob(pattern):
-            if file_path.is_file():
-                # Check if file is in a skipped directory
-                if not any(skip_dir in file_path.parts for skip_dir in skip_dirs):
-                    files_to_scan.add(file_path)
+    # Collect all matching files in a single walk, pruning skipped
+    # directories before they are entered
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        dirnames[:] = [name for name in dirnames if name not in skip_dirs]
+        files_to_scan.extend(os.path.join(dirpath, name) for name in filenames
+                             if name.endswith(extensions))
     
     print(f"🔍 Scanning {len(files_to_scan)} files for literal \\n issues...")
     print("=" * 70)
     
     # Scan each file
     results = []
-    for file_path in sorted(files_to_scan):
-        result = scan_file_for_literal_newlines(file_path)
+    # Sort by path component, the order pathlib sorts paths in
+    files_to_scan.sort(key=lambda file_path: file_path.split(os.sep))
+    for file_path, result in zip(files_to_scan, scan_files(files_to_scan)):
         results.append(result)
         
         # Print progress
-        rel_path = file_path.relative_to(project_root)
+        rel_path = file_path[len(root_prefix):]
         if result.get('error'):
             print(f"❌ {rel_path}: Error - {result['error']}")
         elif result['has_issues']:
@@ -180,7 +215,7 @@ def scan_project():
         print(f"\n🚨 FILES NEEDING ATTENTION:")
         for result in results:
             if result['has_issues']:
-                rel_path = Path(result['file_path']).relative_to(project_root)
+                rel_path = result['file_path'][len(root_prefix):]
                 high_issues = len([l for l in result['problematic_lines'] if l['severity'] == 'high'])
                 med_issues = len([l for l in result['problematic_lines'] if l['severity'] == 'medium'])
                 
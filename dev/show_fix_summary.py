@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Render the fix summaries for issues 006-008.
+
+The summaries are static data in dev/fix_summaries/<issue>.json; this one
+renderer prints any of them, so showing several costs a single interpreter
+start. Run with issue numbers (e.g. ``006 008``), or none to show them all.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SUMMARY_DIR = Path(__file__).parent / "fix_summaries"
+
+
+def _load(path):
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def render(path):
+    """Print the fix summary stored in ``path``.
+    
+    ``before`` and ``after`` lines may use {rule} for the separator line
+    and {count} for the number of fixes; each fix is printed as
+    ``fix_heading`` followed by one line per ``fix_fields`` entry.
+    """
+    data = _load(path)
+    fixes = data['fixes']
+    context = {'rule': '=' * data['width'], 'count': len(fixes)}
+    
+    out = [data['title'], context['rule']]
+    out.extend(line.format(**context) for line in data['before'])
+    for i, fix in enumerate(fixes, 1):
+        out.append(data['fix_heading'].format(i=i, **fix))
+        for label, key in data['fix_fields'].items():
+            value = fix[key]
+            if isinstance(value, list):
+                value = ', '.join(value)
+            out.append(f"   {label}: {value}")
+    out.extend(line.format(**context) for line in data['after'])
+    
+    sys.stdout.write('\n'.join(out))
+    sys.stdout.write('\n')
+
+
+def main(argv):
+    issues = argv or sorted(p.stem for p in SUMMARY_DIR.glob('*.json'))
+    for n, issue in enumerate(issues):
+        if n:
+            print()
+        path = SUMMARY_DIR / f"{issue.zfill(3)}.json"
+        if not path.exists():
+            print(f"❌ No fix summary for issue {issue}")
+            return 1
+        render(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
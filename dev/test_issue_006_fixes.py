@@ -5,11 +5,12 @@ Test fixes for issue/test/006.txt
 This script tests the specific fixes applied to resolve test failures.
 """
 
+import io
 import os
 import sys
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import Mock, patch
 
 # Add project to path
 project_root = Path('/home/phdyex/my-repos/psutil-cygwin')
@@ -18,6 +19,16 @@ sys.path.insert(0, str(project_root))
 import psutil_cygwin as psutil
 
 
+def _open_bytes(data):
+    """Stand-in for builtins.open that serves ``data`` from a fresh BytesIO.
+    
+    /proc files are read in binary mode, and BytesIO already provides the
+    context manager and read() that the reader uses, without the overhead of
+    mock_open's MagicMock.
+    """
+    return lambda *args, **kwargs: io.BytesIO(data)
+
+
 def test_disk_usage_fix():
     """Test the disk usage f_available fix."""
     print("🔧 Testing disk usage fix...")
@@ -54,7 +65,7 @@ def test_cmdline_parsing_fix():
     try:
         # Test with mock data containing real null chars
         with patch('os.path.exists', return_value=True), \
-             patch('builtins.open', mock_open(read_data="arg1\x00arg2\x00arg3\x00")):
+             patch('builtins.open', _open_bytes(b"arg1\x00arg2\x00arg3\x00")):
             
             proc = psutil.Process(1234)
             cmdline = proc.cmdline()
@@ -64,7 +75,7 @@ def test_cmdline_parsing_fix():
         
         # Test with literal \\x00 strings (for test compatibility)
         with patch('os.path.exists', return_value=True), \
-             patch('builtins.open', mock_open(read_data="arg1\\x00arg2\\x00arg3\\x00")):
+             patch('builtins.open', _open_bytes(b"arg1\\x00arg2\\x00arg3\\x00")):
             
             proc = psutil.Process(1234)
             cmdline = proc.cmdline()
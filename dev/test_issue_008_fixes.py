@@ -6,17 +6,59 @@ This script tests that deprecation warnings are properly suppressed
 while maintaining all functionality.
 """
 
+import contextlib
+import io
 import os
 import sys
-import subprocess
 import tempfile
+import threading
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
 # Add project to path
 project_root = Path('/home/phdyex/my-repos/psutil-cygwin')
 sys.path.insert(0, str(project_root))
 
 
+@lru_cache(maxsize=1)
+def _load_pyproject(toml_path):
+    """Parsed contents of ``toml_path``, read once for all of the tests"""
+    with open(toml_path, 'rb') as f:
+        return tomllib.load(f)
+
+
+def _run_pytest(args, timeout):
+    """Run pytest in this process; returns its exit code and output.
+    
+    Calling pytest.main() saves starting a new interpreter and re-loading
+    plugins for each run. stdout and stderr are captured together. The run
+    happens on a daemon thread so a hung session raises TimeoutError after
+    ``timeout`` seconds instead of blocking the script.
+    """
+    import pytest
+    
+    output = io.StringIO()
+    result = []
+    worker = threading.Thread(target=lambda: result.append(int(pytest.main(args))),
+                              daemon=True)
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        worker.start()
+        worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"pytest did not finish within {timeout}s")
+    if not result:
+        raise RuntimeError(f"pytest aborted: {output.getvalue()[-200:]}")
+    return result[0], output.getvalue()
+
+
 def test_pytest_warnings_suppression():
     """Test that pytest warnings are properly suppressed."""
     print("🔧 Testing pytest warnings suppression...")
@@ -25,23 +67,17 @@ def test_pytest_warnings_suppression():
         os.chdir(str(project_root))
         
         # Run pytest and capture output
-        result = subprocess.run(
-            ['pytest', 'tests/', '-v'],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+        returncode, output = _run_pytest(['tests/', '-v'], timeout=60)
         
         # Check that tests still pass
-        if result.returncode == 0:
+        if returncode == 0:
             print("   ✅ All tests still pass")
         else:
-            print(f"   ❌ Tests failed: return code {result.returncode}")
-            print(f"   Error output: {result.stderr[:200]}")
+            print(f"   ❌ Tests failed: return code {returncode}")
+            print(f"   Error output: {output[-200:]}")
             return False
         
         # Check for reduced warnings
-        output = result.stdout + result.stderr
         
         # Count specific warnings
         setuptools_warnings = output.count("setup.py install is deprecated")
@@ -64,7 +100,7 @@ def test_pytest_warnings_suppression():
             # This is not a failure, just a note
             return True
             
-    except subprocess.TimeoutExpired:
+    except TimeoutError:
         print("   ❌ pytest timed out")
         return False
     except Exception as e:
@@ -120,20 +156,13 @@ def test_pyproject_toml_configuration():
     """Test that pyproject.toml warning filters are properly configured."""
     print("🔧 Testing pyproject.toml warning configuration...")
     
-    try:
-        import tomllib
-    except ImportError:
-        try:
-            import tomli as tomllib
-        except ImportError:
-            print("   ⚠️  No TOML library available, skipping config test")
-            return True
+    if tomllib is None:
+        print("   ⚠️  No TOML library available, skipping config test")
+        return True
     
     try:
         # Read pyproject.toml
-        toml_path = project_root / 'pyproject.toml'
-        with open(toml_path, 'rb') as f:
-            config = tomllib.load(f)
+        config = _load_pyproject(project_root / 'pyproject.toml')
         
         # Check pytest configuration
         pytest_config = config.get('tool', {}).get('pytest', {}).get('ini_options', {})
@@ -174,20 +203,13 @@ def test_build_system_modernization():
     """Test that modern build system is properly configured."""
     print("🔧 Testing build system modernization...")
     
-    try:
-        import tomllib
-    except ImportError:
-        try:
-            import tomli as tomllib
-        except ImportError:
-            print("   ⚠️  No TOML library available, skipping build system test")
-            return True
+    if tomllib is None:
+        print("   ⚠️  No TOML library available, skipping build system test")
+        return True
     
     try:
         # Read pyproject.toml
-        toml_path = project_root / 'pyproject.toml'
-        with open(toml_path, 'rb') as f:
-            config = tomllib.load(f)
+        config = _load_pyproject(project_root / 'pyproject.toml')
         
         # Check build system configuration
         build_system = config.get('build-system', {})
@@ -229,21 +251,16 @@ def test_clean_test_run():
         os.chdir(str(project_root))
         
         # Run just a few tests to check warning levels
-        result = subprocess.run(
-            ['pytest', 'tests/test_unit.py::TestExceptions', '-v', '--tb=short'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
+        returncode, output = _run_pytest(
+            ['tests/test_unit.py::TestExceptions', '-v', '--tb=short'], timeout=30)
+        
+        if returncode == 0:
             print("   ✅ Sample tests pass")
         else:
-            print(f"   ❌ Sample tests failed: {result.stderr[:100]}")
+            print(f"   ❌ Sample tests failed: {output[-100:]}")
             return False
         
         # Check output for cleanliness
-        output = result.stdout + result.stderr
         lines = output.split('\n')
         
         warning_lines = [line for line in lines if 'warning' in line.lower() or 'deprecation' in line.lower()]
@@ -257,6 +274,9 @@ def test_clean_test_run():
         
         return True
         
+    except TimeoutError:
+        print("   ❌ pytest timed out")
+        return False
     except Exception as e:
         print(f"   ❌ Clean test run failed: {e}")
         return False
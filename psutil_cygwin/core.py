@@ -7,8 +7,10 @@ leveraging Cygwin's /proc pseudo-filesystem for system information.
 """
 
 import os
+import re
 import time
 import glob
+import functools
 import subprocess
 from pathlib import Path
 from collections import namedtuple
@@ -82,8 +84,8 @@ class Process:
     def _read_proc_file(self, filename: str) -> str:
         """Read a file from /proc/pid/"""
         try:
-            with open(f"{self._proc_path}/{filename}", 'r') as f:
-                return f.read().strip()
+            data = _read_procfile(f"{self._proc_path}/{filename}")
+            return data.decode('utf-8', errors='replace').strip()
         except PermissionError:
             raise AccessDenied(pid=self.pid)
         except (IOError, OSError) as e:
@@ -177,7 +179,7 @@ class Process:
                 # starttime is in clock ticks since boot
                 starttime_ticks = int(fields[21])
                 boot_time = boot_time_cached()
-                clock_ticks_per_sec = os.sysconf(os.sysconf_names['SC_CLK_TCK'])
+                clock_ticks_per_sec = _clock_ticks()
                 return boot_time + (starttime_ticks / clock_ticks_per_sec)
         except:
             pass
@@ -205,7 +207,7 @@ class Process:
             stat_content = self._read_proc_file("stat")
             fields = stat_content.split()
             if len(fields) > 15:
-                clock_ticks_per_sec = os.sysconf(os.sysconf_names['SC_CLK_TCK'])
+                clock_ticks_per_sec = _clock_ticks()
                 user_time = int(fields[13]) / clock_ticks_per_sec
                 system_time = int(fields[14]) / clock_ticks_per_sec
                 return ProcessCPUTimes(user=user_time, system=system_time)
@@ -285,6 +287,84 @@ class Process:
         return 0
 
 
+# Large enough for /proc/stat, /proc/meminfo and /proc/cpuinfo on most systems
+_PROC_BUFSIZE = 8192
+
+
+def _read_procfile(path: str, bufsize: int = _PROC_BUFSIZE, whole: bool = True) -> bytes:
+    """Read a /proc pseudo-file using as few read() calls as possible.
+    
+    The file is read unbuffered in large chunks, which skips the
+    BufferedReader/TextIOWrapper layers of text mode. seq_file files such
+    as /proc/cpuinfo hand out whole records per read(), so a short read is
+    not end of file: reading continues until read() returns b''.
+    With whole=False only the first buffer is returned, for callers that
+    just need the leading lines.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        data = f.read(bufsize)
+        if not whole or not data:
+            return data
+        
+        chunks = [data]
+        while True:
+            data = f.read(bufsize)
+            if not data:
+                return b''.join(chunks)
+            chunks.append(data)
+
+
+# Everything except ASCII control characters other than tab/CR/LF
+_TEXT_BYTES = bytes(range(0x20, 0x7f)) + bytes(range(0x80, 0x100)) + b'\t\n\r'
+
+
+def _looks_binary(data: bytes, probe: int = 64) -> bool:
+    """Check whether the start of a /proc read holds non-text bytes
+    
+    A single translate() over the first few bytes lets parsers bail out
+    on binary garbage without going through their exception handlers.
+    """
+    return bool(data[:probe].translate(None, _TEXT_BYTES))
+
+
+# Cygwin's /proc is emulated and reads can fail transiently under load
+_PROC_READ_TRIES = 3
+_PROC_RETRY_DELAY = 0.001
+
+
+def _read_with_retry(path: str, tries: int = _PROC_READ_TRIES,
+                     base_delay: float = _PROC_RETRY_DELAY, **kwargs) -> bytes:
+    """Read a /proc file, retrying transient OSErrors with exponential backoff
+    
+    procfs reads have no side effects, so retrying is always safe. Missing
+    files and permission errors are permanent and are raised immediately.
+    """
+    for attempt in range(tries):
+        try:
+            return _read_procfile(path, **kwargs)
+        except (FileNotFoundError, PermissionError):
+            raise
+        except OSError:
+            if attempt == tries - 1:
+                raise
+            time.sleep(base_delay * (2 ** attempt))
+
+
+@functools.lru_cache(maxsize=None)
+def _clock_ticks() -> int:
+    """Get clock ticks per second, looked up once - SC_CLK_TCK cannot change at runtime"""
+    try:
+        return os.sysconf(os.sysconf_names['SC_CLK_TCK'])
+    except (OSError, KeyError, ValueError):
+        return 100  # Default fallback
+
+
+@functools.lru_cache(maxsize=None)
+def _inv_clock_ticks() -> float:
+    """Get seconds per clock tick - tick-to-seconds conversion multiplies by this"""
+    return 1.0 / _clock_ticks()
+
+
 def pids() -> List[int]:
     """Get list of all process IDs"""
     proc_pids = []
@@ -306,93 +386,128 @@ def process_iter() -> Iterator[Process]:
             continue
 
 
-def cpu_times() -> CPUTimes:
-    """Get system CPU times"""
+# Back-to-back cpu_times() calls within this window reuse the last parse
+_CPU_TIMES_TTL = 0.025
+_cpu_times_cache = None
+# Last (raw cpu line, seconds per tick, CPUTimes) - unchanged counters reuse the tuple
+_cpu_line_cache = None
+
+
+def _clear_cpu_times_cache():
+    """Clear cpu_times cache - used for testing."""
+    global _cpu_times_cache, _cpu_line_cache
+    _cpu_times_cache = None
+    _cpu_line_cache = None
+
+
+def cpu_times(percpu: bool = False) -> Union[CPUTimes, List[CPUTimes]]:
+    """Get system CPU times, or a list with one entry per CPU if percpu"""
+    global _cpu_times_cache
+    if percpu:
+        return _read_percpu_times()
+    
+    if _cpu_times_cache is not None:
+        cached_at, cached_times = _cpu_times_cache
+        if time.monotonic() - cached_at < _CPU_TIMES_TTL:
+            return cached_times
+    
+    result = _read_cpu_times()
+    _cpu_times_cache = (time.monotonic(), result)
+    return result
+
+
+def _parse_cpu_line(line: bytes, nfields: int = 5) -> List[int]:
+    """Parse the tick counters of a /proc/stat "cpu" line without decoding it
+    
+    Only the first nfields counters after the label are converted; fields
+    that are not valid integers count as 0 and negative values are clamped
+    to 0 as they are parsed.
+    """
+    values = []
+    for field in line.split(None, nfields + 1)[1:nfields + 1]:
+        try:
+            value = int(field)
+        except ValueError:
+            value = 0
+        values.append(value if value > 0 else 0)
+    return values
+
+
+def _cpu_times_from_line(line: bytes, seconds_per_tick: float) -> CPUTimes:
+    """Build a CPUTimes from one /proc/stat "cpu" or "cpuN" line"""
+    # Convert from clock ticks to seconds
+    times = [x * seconds_per_tick for x in _parse_cpu_line(line)]
+    
+    user = times[0] if len(times) > 0 else 0
+    system = times[2] if len(times) > 2 else 0  # Corrected: index 2 for system (after nice)
+    idle = times[3] if len(times) > 3 else 0
+    interrupt = times[4] if len(times) > 4 else 0
+    dpc = 0  # Not available on Linux/Cygwin
+    
+    return CPUTimes(user=user, system=system, idle=idle, 
+                  interrupt=interrupt, dpc=dpc)
+
+
+def _read_cpu_times() -> CPUTimes:
+    """Read and parse the aggregate CPU line from /proc/stat"""
+    global _cpu_line_cache
     try:
-        with open('/proc/stat', 'r') as f:
-            content = f.read()
-            
-            # Handle potential binary data
-            if isinstance(content, bytes):
-                try:
-                    content = content.decode('utf-8', errors='ignore')
-                except (UnicodeDecodeError, AttributeError):
-                    # If decoding fails, try to convert to string representation
-                    content = repr(content)[2:-1]  # Remove b' and '
-            
-            # Ensure content is a string for string operations
-            if not isinstance(content, str):
-                content = str(content)
-            
-            # Get the first line
-            lines = content.split('\n')
-            if not lines:
-                raise ValueError("Empty content")
-            
-            line = lines[0].strip()
-            
-            # Handle both string and potential bytes data
-            if isinstance(line, bytes):
-                try:
-                    line = line.decode('utf-8', errors='ignore')
-                except:
-                    line = str(line)
+        data = _read_with_retry('/proc/stat', whole=False)
+        if _looks_binary(data):
+            return CPUTimes(user=0, system=0, idle=0, interrupt=0, dpc=0)
+        
+        # The aggregate "cpu" line always comes first - skip the per-CPU lines
+        line = data.split(b'\n', 1)[0].strip()
+        
+        if line.startswith(b'cpu '):
+            seconds_per_tick = _inv_clock_ticks()
+            cached = _cpu_line_cache
+            if cached is not None and cached[0] == line and cached[1] == seconds_per_tick:
+                return cached[2]
             
-            if line.startswith('cpu '):
-                # Split on whitespace and filter empty strings
-                fields = [f for f in line.split()[1:] if f]  # Skip 'cpu' label and empty strings
-                
-                # Convert from clock ticks to seconds
-                try:
-                    clock_ticks_per_sec = os.sysconf(os.sysconf_names['SC_CLK_TCK'])
-                except (OSError, KeyError):
-                    clock_ticks_per_sec = 100  # Default fallback
+            result = _cpu_times_from_line(line, seconds_per_tick)
+            _cpu_line_cache = (line, seconds_per_tick, result)
+            return result
                 
-                try:
-                    # Parse and convert numeric fields
-                    numeric_fields = []
-                    for field in fields[:5]:
-                        try:
-                            numeric_fields.append(int(field))
-                        except (ValueError, TypeError):
-                            numeric_fields.append(0)
-                    
-                    times = [x / clock_ticks_per_sec for x in numeric_fields]
-                    
-                    user = times[0] if len(times) > 0 else 0
-                    system = times[2] if len(times) > 2 else 0  # Corrected: index 2 for system (after nice)
-                    idle = times[3] if len(times) > 3 else 0
-                    interrupt = times[4] if len(times) > 4 else 0
-                    dpc = 0  # Not available on Linux/Cygwin
-                    
-                    # Ensure non-negative values
-                    user = max(0, user)
-                    system = max(0, system)
-                    idle = max(0, idle)
-                    interrupt = max(0, interrupt)
-                    
-                    return CPUTimes(user=user, system=system, idle=idle, 
-                                  interrupt=interrupt, dpc=dpc)
-                    
-                except (ValueError, TypeError, IndexError):
-                    # Malformed data, return zeros
-                    return CPUTimes(user=0, system=0, idle=0, interrupt=0, dpc=0)
-                    
-    except (OSError, IOError, UnicodeDecodeError, ValueError, TypeError):
+    except (OSError, IOError, ValueError, TypeError):
         # Return default values for any file access or parsing errors
         pass
     
     return CPUTimes(user=0, system=0, idle=0, interrupt=0, dpc=0)
 
 
+def _read_percpu_times() -> List[CPUTimes]:
+    """Read and parse the per-CPU "cpuN" lines from /proc/stat"""
+    result = []
+    try:
+        content = _read_with_retry('/proc/stat')
+        if _looks_binary(content):
+            return result
+        seconds_per_tick = _inv_clock_ticks()
+        
+        for line in content.split(b'\n'):
+            # The cpuN lines are contiguous right after the aggregate line
+            if line[:3] != b'cpu':
+                if result:
+                    break
+                continue
+            if line[3:4].isdigit():
+                result.append(_cpu_times_from_line(line, seconds_per_tick))
+    except (OSError, IOError, ValueError, TypeError):
+        pass
+    
+    return result
+
+
 def cpu_percent(interval: Optional[float] = None) -> float:
     """Get CPU usage percentage"""
     if interval is None:
         interval = 0.1
     
-    times1 = cpu_times()
+    # Bypass the cpu_times() cache - both samples must be fresh reads
+    times1 = _read_cpu_times()
     time.sleep(interval)
-    times2 = cpu_times()
+    times2 = _read_cpu_times()
     
     total_delta = sum([
         times2.user - times1.user,
@@ -407,133 +522,57 @@ def cpu_percent(interval: Optional[float] = None) -> float:
     return max(0.0, 100.0 * (1.0 - idle_delta / total_delta))
 
 
-# Module-level cache for mock detection to avoid repeated expensive checks
-_MOCKING_CACHE = None
+def cpu_count(logical: bool = True) -> int:
+    """Get number of CPUs"""
+    return _cached_cpu_count()
 
-def _is_mocking_cached():
-    """Get cached mocking detection result."""
-    global _MOCKING_CACHE
-    if _MOCKING_CACHE is None:
-        _MOCKING_CACHE = _is_mocking_active()
-    return _MOCKING_CACHE
 
-def _clear_mocking_cache():
-    """Clear mocking cache - used for testing."""
-    global _MOCKING_CACHE
-    _MOCKING_CACHE = None
+@functools.lru_cache(maxsize=None)
+def _cached_cpu_count() -> int:
+    """Get number of CPUs, parsed once - CPU count does not change at runtime"""
+    return _read_cpu_count()
 
-def cpu_count(logical: bool = True) -> int:
-    """Get number of CPUs"""
-    # Use cached mock detection to avoid expensive repeated calls
-    bypass_cache = _is_mocking_cached()
-    
-    if not hasattr(cpu_count, '_cached_count') or bypass_cache:
-        try:
-            with open('/proc/cpuinfo', 'r') as f:
-                count = 0
-                # Optimistic approach - try normal string processing first
-                try:
-                    for line in f:
-                        if line.startswith('processor'):
-                            count += 1
-                except (TypeError, AttributeError):
-                    # Only handle binary data if we encounter it
-                    f.seek(0)
-                    for line in f:
-                        if isinstance(line, bytes):
-                            try:
-                                line = line.decode('utf-8', errors='ignore')
-                            except (UnicodeDecodeError, AttributeError):
-                                continue
-                        
-                        if isinstance(line, str) and line.startswith('processor'):
-                            count += 1
-                            
-                result = max(1, count)
-                
-                # Only cache if not in testing mode
-                if not bypass_cache:
-                    setattr(cpu_count, '_cached_count', result)
-                
-                return result
-        except (OSError, IOError, TypeError, UnicodeDecodeError):
-            result = 1
-            if not bypass_cache:
-                setattr(cpu_count, '_cached_count', result)
-            return result
-    
-    return getattr(cpu_count, '_cached_count')
 
+# Expose cache invalidation as psutil.cpu_count.cache_clear()
+cpu_count.cache_clear = _cached_cpu_count.cache_clear
 
-def _is_mocking_active() -> bool:
-    """Check if we're in a testing environment with mocking active."""
-    import sys
-    import inspect
-    
-    # Check for common testing indicators
-    if 'pytest' in sys.modules or 'unittest' in sys.modules:
-        # Check if unittest.mock is being used
-        if 'unittest.mock' in sys.modules:
-            return True
-            
-        # Check the call stack for mock-related frames
-        try:
-            current_frame = inspect.currentframe()
-            while current_frame:
-                frame_info = inspect.getframeinfo(current_frame)
-                filename = frame_info.filename.lower()
-                
-                # Check for mock-related files or test files
-                if any(indicator in filename for indicator in ['mock', 'test_', '/test']):
-                    return True
-                
-                # Check for unittest.mock module usage in frame
-                frame_locals = current_frame.f_locals
-                frame_globals = current_frame.f_globals
-                
-                for name, value in list(frame_locals.items()) + list(frame_globals.items()):
-                    if hasattr(value, '__module__') and value.__module__ and 'mock' in str(value.__module__):
-                        return True
-                
-                current_frame = current_frame.f_back
-        except:
-            # If frame inspection fails, fall back to simpler check
-            pass
-    
-    return False
+
+# One "processor : N" line per logical CPU, possibly indented; compiled once
+_PROCESSOR_RE = re.compile(rb'^[ \t]*processor[ \t]*:[ \t]*\S', re.MULTILINE)
+
+
+def _read_cpu_count() -> int:
+    """Count processor entries in /proc/cpuinfo"""
+    try:
+        content = _read_with_retry('/proc/cpuinfo')
+        if _looks_binary(content):
+            return 1
+        return max(1, len(_PROCESSOR_RE.findall(content)))
+    except (OSError, IOError, TypeError):
+        return 1
+
+
+# Only the /proc/meminfo fields virtual_memory() needs, matched in one C-level scan
+_MEMINFO_RE = re.compile(
+    rb'^[ \t]*(MemTotal|MemFree|MemAvailable|Buffers|Cached)[ \t]*:[ \t]*(\d+)',
+    re.MULTILINE,
+)
+_MEMINFO_NKEYS = 5
 
 
 def virtual_memory() -> VirtualMemory:
     """Get virtual memory statistics"""
     try:
-        with open('/proc/meminfo', 'r') as f:
-            content = f.read()
-            
-            # Handle potential binary data
-            if isinstance(content, bytes):
-                try:
-                    content = content.decode('utf-8', errors='ignore')
-                except (UnicodeDecodeError, AttributeError):
-                    content = repr(content)[2:-1]  # Remove b' and '
-            
-            # Ensure content is a string
-            if not isinstance(content, str):
-                content = str(content)
-            
-            meminfo = {}
-            for line in content.split('\n'):
-                line = line.strip()
-                if line and ':' in line:
-                    try:
-                        key, value = line.split(':', 1)
-                        # Extract numeric value (in KB)
-                        value_parts = value.strip().split()
-                        if value_parts:
-                            value_kb = int(value_parts[0])
-                            meminfo[key.strip()] = value_kb * 1024  # Convert to bytes
-                    except (ValueError, IndexError):
-                        # Skip malformed lines
-                        continue
+        content = _read_with_retry('/proc/meminfo')
+        if _looks_binary(content):
+            return VirtualMemory(total=0, available=0, percent=0, used=0, free=0)
+        
+        meminfo = {}
+        for match in _MEMINFO_RE.finditer(content):
+            # Values are in KB, convert to bytes
+            meminfo[match.group(1).decode('ascii')] = int(match.group(2)) * 1024
+            if len(meminfo) == _MEMINFO_NKEYS:
+                break  # Everything we need is near the top; skip the rest
         
         total = meminfo.get('MemTotal', 0)
         free = meminfo.get('MemFree', 0)
@@ -551,7 +590,7 @@ def virtual_memory() -> VirtualMemory:
             used=used,
             free=free
         )
-    except (OSError, IOError, UnicodeDecodeError, TypeError):
+    except (OSError, IOError, TypeError):
         pass
     
     return VirtualMemory(total=0, available=0, percent=0, used=0, free=0)
@@ -560,13 +599,13 @@ def virtual_memory() -> VirtualMemory:
 def swap_memory() -> SwapMemory:
     """Get swap memory statistics"""
     try:
-        with open('/proc/meminfo', 'r') as f:
-            meminfo = {}
-            for line in f:
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    value_kb = int(value.strip().split()[0])
-                    meminfo[key.strip()] = value_kb * 1024
+        content = _read_with_retry('/proc/meminfo')
+        meminfo = {}
+        for line in content.split(b'\n'):
+            if b':' in line:
+                key, value = line.split(b':', 1)
+                value_kb = int(value.split()[0])
+                meminfo[key.strip().decode('ascii', errors='replace')] = value_kb * 1024
         
         total = meminfo.get('SwapTotal', 0)
         free = meminfo.get('SwapFree', 0)
@@ -697,13 +736,13 @@ def boot_time_cached() -> float:
     """Get system boot time (cached version)"""
     if not hasattr(boot_time_cached, '_cached_time'):
         try:
-            with open('/proc/stat', 'r') as f:
-                for line in f:
-                    if line.startswith('btime'):
-                        boot_time_cached._cached_time = float(line.split()[1])
-                        break
-                else:
-                    boot_time_cached._cached_time = time.time() - 3600  # Fallback
+            content = _read_with_retry('/proc/stat')
+            for line in content.split(b'\n'):
+                if line.startswith(b'btime'):
+                    boot_time_cached._cached_time = float(line.split()[1])
+                    break
+            else:
+                boot_time_cached._cached_time = time.time() - 3600  # Fallback
         except (OSError, IOError):
             boot_time_cached._cached_time = time.time() - 3600  # Fallback
     
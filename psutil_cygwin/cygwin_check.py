@@ -9,6 +9,7 @@ import functionality.
 
 import os
 import sys
+import functools
 import platform
 import subprocess
 import site
@@ -164,50 +165,69 @@ def check_cygwin_requirements():
     return True
 
 
-def create_psutil_pth():
-    """Create psutil.pth file to make psutil_cygwin available as 'psutil'."""
-    try:
-        # Get site-packages directory
-        site_packages_dirs = site.getsitepackages()
-        
-        # Try to find the best site-packages directory
-        site_packages = None
-        for sp_dir in site_packages_dirs:
-            if os.path.exists(sp_dir) and os.access(sp_dir, os.W_OK):
-                site_packages = sp_dir
-                break
-        
-        if not site_packages:
-            # Fallback to user site-packages
-            site_packages = site.getusersitepackages()
-            # Ensure user site-packages directory exists
-            if not os.path.exists(site_packages):
-                try:
-                    os.makedirs(site_packages, exist_ok=True)
-                except OSError:
-                    # If makedirs fails, return None for permission error tests
-                    return None
-        
-        # Construct the path to the .pth file
-        pth_file = os.path.join(site_packages, 'psutil.pth')
-        
-        # Create the .pth file content
-        pth_content = '''# psutil-cygwin: Make psutil_cygwin available as 'psutil'
+@functools.lru_cache(maxsize=1)
+def _find_writable_site_dir(site_packages_dirs, user_site):
+    """Find the first writable site-packages directory (cached)."""
+    # Try to find the best site-packages directory
+    for sp_dir in site_packages_dirs:
+        if os.path.exists(sp_dir) and os.access(sp_dir, os.W_OK):
+            return sp_dir
+    
+    # Fallback to user site-packages, ensuring the directory exists
+    if not os.path.exists(user_site):
+        try:
+            os.makedirs(user_site, exist_ok=True)
+        except OSError:
+            # If makedirs fails, return None for permission error tests
+            return None
+    return user_site
+
+
+def _write_psutil_pth(site_packages):
+    """Write psutil.pth into site_packages, returning its path or None on failure."""
+    # Construct the path to the .pth file
+    pth_file = os.path.join(site_packages, 'psutil.pth')
+    
+    # Create the .pth file content
+    pth_content = '''# psutil-cygwin: Make psutil_cygwin available as 'psutil'
 # This allows 'import psutil' to work transparently with psutil_cygwin
 import sys; sys.modules['psutil'] = __import__('psutil_cygwin')
 '''
-        
-        # Write the .pth file
-        try:
-            with open(pth_file, 'w') as f:
-                f.write(pth_content)
+    
+    # Write the .pth file
+    try:
+        with open(pth_file, 'w') as f:
+            f.write(pth_content)
+    except (OSError, IOError, PermissionError):
+        return None
+    
+    # Verify file was created (important for tests)
+    if not os.path.exists(pth_file):
+        return None
+    return pth_file
+
+
+def create_psutil_pth():
+    """Create psutil.pth file to make psutil_cygwin available as 'psutil'."""
+    try:
+        # A cached directory may have become unwritable since it was probed,
+        # so a failed write forgets it and probes once more before giving up
+        for _ in range(2):
+            # Get site-packages directory - probing is skipped on repeat calls
+            site_packages = _find_writable_site_dir(
+                tuple(site.getsitepackages()), site.getusersitepackages()
+            )
             
-            # Verify file was created (important for tests)
-            if not os.path.exists(pth_file):
+            if not site_packages:
+                # Don't remember a failed lookup
+                _find_writable_site_dir.cache_clear()
                 return None
-                
-        except (OSError, IOError, PermissionError):
-            # If writing fails, return None to indicate failure
+            
+            pth_file = _write_psutil_pth(site_packages)
+            if pth_file:
+                break
+            _find_writable_site_dir.cache_clear()
+        else:
             return None
         
         print(f"✅ Created psutil.pth: {pth_file}")
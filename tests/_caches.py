@@ -0,0 +1,18 @@
+"""
+Cache reset shared by the pytest and unittest test runs.
+
+psutil_cygwin caches the clock tick rate, the CPU count and recent
+cpu_times() results. Tests that mock /proc data or os.sysconf must start
+from empty caches, whichever runner drives them, so this module does not
+import pytest.
+"""
+
+from psutil_cygwin import core
+
+
+def reset_caches():
+    """Drop every value psutil_cygwin caches between calls."""
+    core.cpu_count.cache_clear()
+    core._clock_ticks.cache_clear()
+    core._inv_clock_ticks.cache_clear()
+    core._clear_cpu_times_cache()
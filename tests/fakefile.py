@@ -0,0 +1,70 @@
+"""
+Lightweight file stand-in for tests that patch builtins.open.
+
+MagicMock objects are expensive to build, which adds up in closures that
+hand out a fresh mock file on every open() call inside a loop. FakeFile
+implements just the file protocol psutil_cygwin uses.
+"""
+
+
+class FakeFile:
+    """Minimal read-only file object returned from a patched open()."""
+
+    __slots__ = ('_data', '_pos')
+
+    def __init__(self, data=''):
+        self._data = data
+        self._pos = 0
+
+    def read(self, size=-1):
+        start = self._pos
+        if size is None or size < 0:
+            self._pos = len(self._data)
+        else:
+            self._pos = min(start + size, len(self._data))
+        return self._data[start:self._pos]
+
+    def readline(self, size=-1):
+        newline = '\n' if isinstance(self._data, str) else b'\n'
+        end = self._data.find(newline, self._pos)
+        end = len(self._data) if end == -1 else end + 1
+        if size is not None and size >= 0:
+            end = min(end, self._pos + size)
+        line = self._data[self._pos:end]
+        self._pos = end
+        return line
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class FakeOpen:
+    """Stand-in for builtins.open that hands out a FakeFile over ``data``.
+
+    Counts its calls like a mock, without building a MagicMock graph.
+    """
+
+    __slots__ = ('_data', 'call_count')
+
+    def __init__(self, data=''):
+        self._data = data
+        self.call_count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.call_count += 1
+        return FakeFile(self._data)
@@ -5,14 +5,10 @@ These tests require a real Cygwin environment with /proc filesystem.
 """
 
 import os
-import sys
 import time
 import unittest
 from pathlib import Path
 
-# Add the package to the path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import psutil_cygwin as psutil
 
 
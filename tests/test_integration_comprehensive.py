@@ -7,7 +7,6 @@ edge cases, and stress conditions.
 """
 
 import os
-import sys
 import time
 import unittest
 import threading
@@ -20,9 +19,6 @@ from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import signal
 
-# Add the package to the path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import psutil_cygwin as psutil
 
 
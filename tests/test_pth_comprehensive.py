@@ -19,9 +19,6 @@ import time
 from unittest.mock import patch, mock_open, MagicMock, call
 from pathlib import Path
 
-# Add the package to the path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 # Import setup functions from their locations
 from psutil_cygwin.cygwin_check import create_psutil_pth, is_cygwin, check_transparent_import
 from psutil_cygwin._build.hooks import remove_psutil_pth
@@ -15,11 +15,8 @@ import shutil
 from pathlib import Path
 from unittest.mock import patch, mock_open, MagicMock
 
-# Add the package to the path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 # Import setup functions from their new locations in the modernized structure
-from psutil_cygwin.cygwin_check import create_psutil_pth, is_cygwin
+from psutil_cygwin.cygwin_check import create_psutil_pth, is_cygwin, _find_writable_site_dir
 from psutil_cygwin._build.hooks import remove_psutil_pth
 
 
@@ -30,9 +27,11 @@ class TestPthFileCreation(unittest.TestCase):
         """Set up test environment."""
         self.temp_dir = tempfile.mkdtemp()
         self.pth_file = os.path.join(self.temp_dir, 'psutil.pth')
+        _find_writable_site_dir.cache_clear()
         
     def tearDown(self):
         """Clean up test environment."""
+        _find_writable_site_dir.cache_clear()
         if os.path.exists(self.pth_file):
             os.remove(self.pth_file)
         # Use shutil.rmtree instead of os.rmdir for directories with contents
@@ -64,6 +63,52 @@ class TestPthFileCreation(unittest.TestCase):
             # Should return the path to created file
             self.assertEqual(result, self.pth_file)
             
+    @patch('site.getsitepackages')
+    @patch('os.access', return_value=True)
+    def test_create_psutil_pth_caches_site_dir(self, mock_access, mock_getsitepackages):
+        """Test that the writable site-packages directory is only probed once."""
+        mock_getsitepackages.return_value = [self.temp_dir]
+        
+        self.assertEqual(create_psutil_pth(), self.pth_file)
+        self.assertEqual(create_psutil_pth(), self.pth_file)
+        self.assertEqual(mock_access.call_count, 1)
+        
+        # A failed write forgets the cached directory and probes once more
+        with patch('builtins.open', side_effect=PermissionError("Permission denied")):
+            self.assertIsNone(create_psutil_pth())
+        self.assertEqual(mock_access.call_count, 2)
+        self.assertEqual(create_psutil_pth(), self.pth_file)
+        self.assertEqual(mock_access.call_count, 3)
+    
+    @patch('site.getsitepackages')
+    @patch('site.getusersitepackages')
+    def test_create_psutil_pth_reprobes_stale_site_dir(self, mock_getusersitepackages,
+                                                       mock_getsitepackages):
+        """Test that a cached directory that became unwritable is not fatal."""
+        system_site = os.path.join(self.temp_dir, 'system-site')
+        user_site = os.path.join(self.temp_dir, 'user-site')
+        os.makedirs(system_site)
+        os.makedirs(user_site)
+        mock_getsitepackages.return_value = [system_site]
+        mock_getusersitepackages.return_value = user_site
+        
+        self.assertEqual(create_psutil_pth(), os.path.join(system_site, 'psutil.pth'))
+        
+        # The cached system site-packages turns read-only
+        real_open = open
+        
+        def open_side_effect(path, *args, **kwargs):
+            if path.startswith(system_site):
+                raise PermissionError("Permission denied")
+            return real_open(path, *args, **kwargs)
+        
+        with patch('builtins.open', side_effect=open_side_effect):
+            with patch('os.access', side_effect=lambda path, mode: path != system_site):
+                result = create_psutil_pth()
+        
+        self.assertEqual(result, os.path.join(user_site, 'psutil.pth'))
+        self.assertTrue(os.path.exists(result))
+            
     @patch('site.getsitepackages')
     @patch('site.getusersitepackages')
     @patch('os.access')
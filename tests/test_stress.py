@@ -7,7 +7,6 @@ that could reveal hidden bugs or performance issues.
 """
 
 import os
-import sys
 import time
 import unittest
 import threading
@@ -17,20 +16,24 @@ import signal
 import gc
 import random
 import string
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 import weakref
 
-# Add the package to the path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import psutil_cygwin as psutil
+from psutil_cygwin import core
+from tests.fakefile import FakeFile, FakeOpen
+from tests._caches import reset_caches
 
 
 class TestExtremeEdgeCases(unittest.TestCase):
     """Test extreme edge cases and boundary conditions."""
     
+    def setUp(self):
+        """Start from empty library caches, as conftest.py does under pytest."""
+        reset_caches()
+        
     def test_extreme_pid_values(self):
         """Test with extreme PID values."""
         extreme_pids = [
@@ -54,28 +57,28 @@ class TestExtremeEdgeCases(unittest.TestCase):
                         with self.assertRaises(psutil.NoSuchProcess):
                             psutil.Process(pid)
     
-    @patch('builtins.open', new_callable=mock_open)
+    @patch('builtins.open')
     def test_extreme_cpu_values(self, mock_file):
         """Test CPU parsing with extreme values."""
         extreme_cases = [
             # Very large numbers
-            "cpu  999999999999999999 888888888888888888 777777777777777777 666666666666666666",
+            b"cpu  999999999999999999 888888888888888888 777777777777777777 666666666666666666",
             # Maximum possible values
-            f"cpu  {2**63-1} {2**63-1} {2**63-1} {2**63-1}",
+            b"cpu  %d %d %d %d" % ((2**63-1,) * 4),
             # Zero values
-            "cpu  0 0 0 0 0 0 0 0",
+            b"cpu  0 0 0 0 0 0 0 0",
             # Single huge value
-            "cpu  999999999999999999",
+            b"cpu  999999999999999999",
             # Negative values (should be handled gracefully)
-            "cpu  -1 -2 -3 -4",
+            b"cpu  -1 -2 -3 -4",
             # Mixed positive/negative
-            "cpu  1000 -500 2000 -100",
+            b"cpu  1000 -500 2000 -100",
         ]
         
         with patch('os.sysconf', return_value=100):
             for cpu_data in extreme_cases:
                 with self.subTest(cpu_data=cpu_data[:50]):
-                    mock_file.return_value.read.return_value = cpu_data + "\n"
+                    mock_file.side_effect = FakeOpen(cpu_data + b"\n")
                     
                     try:
                         times = psutil.cpu_times()
@@ -290,6 +293,10 @@ class TestResourceExhaustion(unittest.TestCase):
 class TestErrorRecoveryAndRobustness(unittest.TestCase):
     """Test error recovery and robustness under adverse conditions."""
     
+    def setUp(self):
+        """Start from empty library caches, as conftest.py does under pytest."""
+        reset_caches()
+        
     @patch('builtins.open')
     def test_intermittent_file_errors(self, mock_open_builtin):
         """Test handling of intermittent file access errors."""
@@ -302,13 +309,8 @@ class TestErrorRecoveryAndRobustness(unittest.TestCase):
             if call_count % 3 == 0:  # Fail every 3rd call
                 raise OSError("Intermittent failure")
             
-            # Return a mock file object
-            mock_file = MagicMock()
-            mock_file.read.return_value = "cpu  100 200 300 400\n"
-            mock_file.readline.return_value = "cpu  100 200 300 400\n"
-            mock_file.__enter__ = MagicMock(return_value=mock_file)
-            mock_file.__exit__ = MagicMock(return_value=None)
-            return mock_file
+            # Return a lightweight fake file object
+            return FakeFile(b"cpu  100 200 300 400\n")
         
         mock_open_builtin.side_effect = intermittent_failure
         
@@ -317,6 +319,8 @@ class TestErrorRecoveryAndRobustness(unittest.TestCase):
         failure_count = 0
         
         for _ in range(12):  # Increase iterations to ensure some successes
+            # Every call must reach /proc/stat, not the short-lived cache
+            core._clear_cpu_times_cache()
             try:
                 times = psutil.cpu_times()
                 if times.user > 0:  # Valid data
@@ -326,9 +330,11 @@ class TestErrorRecoveryAndRobustness(unittest.TestCase):
             except OSError:
                 failure_count += 1
         
-        # Should have some successes and handle failures gracefully
-        self.assertGreater(success_count, 0)
-        self.assertGreater(failure_count, 0)
+        # Transient failures are retried, so every call should succeed
+        self.assertEqual(success_count, 12)
+        self.assertEqual(failure_count, 0)
+        # 12 good reads plus the 5 failed opens (every 3rd) that were retried
+        self.assertEqual(call_count, 17)
     
     def test_corrupted_proc_filesystem_simulation(self):
         """Test behavior with simulated corrupted /proc files."""
@@ -336,18 +342,18 @@ class TestErrorRecoveryAndRobustness(unittest.TestCase):
             # Binary data
             (b'\x00\x01\x02\x03\x04\x05', "binary data"),
             # Truncated files
-            ("cpu  100 2", "truncated"),
+            (b"cpu  100 2", "truncated"),
             # Random text
-            ("".join(random.choices(string.ascii_letters, k=1000)), "random text"),
+            ("".join(random.choices(string.ascii_letters, k=1000)).encode(), "random text"),
             # Very long lines
-            ("cpu  " + " ".join(str(random.randint(0, 999999)) for _ in range(1000)), "very long"),
+            (("cpu  " + " ".join(str(random.randint(0, 999999)) for _ in range(1000))).encode(), "very long"),
             # Mixed encodings (Latin-1)
-            ("cpu  100 200 300 \xff\xfe\xfd", "mixed encoding"),
+            (b"cpu  100 200 300 \xff\xfe\xfd", "mixed encoding"),
         ]
         
         for corrupted_data, description in corrupted_scenarios:
             with self.subTest(scenario=description):
-                with patch('builtins.open', mock_open(read_data=corrupted_data)):
+                with patch('builtins.open', FakeOpen(corrupted_data)):
                     try:
                         # Functions should not crash on corrupted data
                         times = psutil.cpu_times()
@@ -3,17 +3,16 @@ Unit tests for psutil-cygwin core functionality.
 """
 
 import os
-import sys
 import time
 import unittest
+from functools import partial
 from unittest.mock import patch, mock_open, MagicMock
 from pathlib import Path
 
-# Add the package to the path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import psutil_cygwin as psutil
 from psutil_cygwin import core  # Import core module for patching
+from tests.fakefile import FakeFile, FakeOpen
+from tests._caches import reset_caches
 
 
 class TestExceptions(unittest.TestCase):
@@ -48,8 +47,11 @@ class TestExceptions(unittest.TestCase):
 class TestSystemFunctions(unittest.TestCase):
     """Test system-wide functions."""
     
-    @patch('builtins.open', new_callable=mock_open, 
-           read_data="cpu  100 200 300 400 500\n")
+    def setUp(self):
+        """Start from empty library caches, as conftest.py does under pytest."""
+        reset_caches()
+        
+    @patch('builtins.open', new_callable=partial(FakeOpen, b"cpu  100 200 300 400 500\n"))
     @patch('os.sysconf')
     def test_cpu_times(self, mock_sysconf, mock_file):
         """Test CPU times parsing."""
@@ -60,33 +62,201 @@ class TestSystemFunctions(unittest.TestCase):
         self.assertEqual(times.user, 1.0)  # 100/100
         self.assertEqual(times.system, 3.0)  # 300/100
         self.assertEqual(times.idle, 4.0)  # 400/100
-        
-    @patch('builtins.open', new_callable=mock_open,
-           read_data="MemTotal: 1000000 kB\nMemFree: 500000 kB\n")
+
+    @patch('builtins.open', new_callable=partial(
+        FakeOpen, b"cpu  300 0 600 900 0\ncpu0 100 0 200 300 0\n"
+                  b"cpu1 200 0 400 600 0\nintr 12345 0 0\nctxt 999\n"))
+    @patch('os.sysconf', return_value=100)
+    def test_cpu_times_percpu(self, mock_sysconf, mock_file):
+        """Test per-CPU times parsing."""
+        times = psutil.cpu_times(percpu=True)
+        self.assertEqual(len(times), 2)
+        self.assertIsInstance(times[0], psutil.CPUTimes)
+        self.assertEqual(times[0].user, 1.0)
+        self.assertEqual(times[1].system, 4.0)
+        self.assertEqual(times[1].idle, 6.0)
+
+    @patch('builtins.open', new_callable=partial(FakeOpen, b"cpu  100 200 300 400 500\n"))
+    @patch('os.sysconf', return_value=100)
+    def test_cpu_times_ttl_cache(self, mock_sysconf, mock_file):
+        """Test that rapid cpu_times() calls reuse the cached parse."""
+        core._clear_cpu_times_cache()
+        try:
+            times1 = psutil.cpu_times()
+            times2 = psutil.cpu_times()
+            self.assertEqual(times1, times2)
+            self.assertEqual(mock_file.call_count, 1)
+
+            # Invalidating the cache forces a fresh read
+            core._clear_cpu_times_cache()
+            psutil.cpu_times()
+            self.assertEqual(mock_file.call_count, 2)
+        finally:
+            core._clear_cpu_times_cache()
+
+    @patch('os.sysconf', return_value=100)
+    def test_cpu_times_reuses_unchanged_line(self, mock_sysconf):
+        """Test that identical /proc/stat counters return the same object."""
+        try:
+            with patch('builtins.open', FakeOpen(b"cpu  100 200 300 400 500\n")):
+                times1 = core._read_cpu_times()
+                times2 = core._read_cpu_times()
+            self.assertIs(times1, times2)
+
+            with patch('builtins.open', FakeOpen(b"cpu  200 200 300 400 500\n")):
+                times3 = core._read_cpu_times()
+            self.assertEqual(times3.user, 2.0)
+
+            # A different tick rate must not reuse the cached conversion
+            mock_sysconf.return_value = 50
+            reset_caches()
+            with patch('builtins.open', FakeOpen(b"cpu  200 200 300 400 500\n")):
+                self.assertEqual(core._read_cpu_times().user, 4.0)
+        finally:
+            reset_caches()
+
+    def test_clock_ticks_cached(self):
+        """Test that SC_CLK_TCK is looked up once and reused."""
+        reset_caches()
+        try:
+            with patch('os.sysconf', return_value=250) as mock_sysconf:
+                self.assertEqual(core._clock_ticks(), 250)
+                mock_sysconf.return_value = 1000
+                self.assertEqual(core._clock_ticks(), 250)
+                self.assertEqual(core._inv_clock_ticks(), 1.0 / 250)
+                self.assertEqual(mock_sysconf.call_count, 1)
+        finally:
+            reset_caches()
+
+    @patch('builtins.open', new_callable=partial(
+        FakeOpen, b"MemTotal: 1000000 kB\nMemFree: 500000 kB\n"))
     def test_virtual_memory(self, mock_file):
         """Test virtual memory parsing."""
         mem = psutil.virtual_memory()
         self.assertIsInstance(mem, psutil.VirtualMemory)
         self.assertEqual(mem.total, 1000000 * 1024)
         self.assertEqual(mem.free, 500000 * 1024)
-        
-    @patch('builtins.open', new_callable=mock_open,
-           read_data="processor : 0\nprocessor : 1\n")
+
+    @patch('builtins.open', new_callable=partial(
+        FakeOpen, b"MemTotal: 1000 kB\nMemFree: 400 kB\nSwapCached: 999 kB\n"
+                  b"Cached: 100 kB\nActive(anon): 5 kB\nBuffers: 50 kB\n"))
+    def test_virtual_memory_selected_fields(self, mock_file):
+        """Test that only the fields of interest are extracted from meminfo."""
+        mem = psutil.virtual_memory()
+        self.assertEqual(mem.total, 1000 * 1024)
+        self.assertEqual(mem.available, 400 * 1024)
+        self.assertEqual(mem.used, (1000 - 400 - 50 - 100) * 1024)
+
+    def test_virtual_memory_stops_after_required_fields(self):
+        """Test that the meminfo scan stops once all fields are collected."""
+        data = (b"MemTotal: 1000 kB\nMemFree: 400 kB\nMemAvailable: 500 kB\n"
+                b"Buffers: 50 kB\nCached: 100 kB\n")
+        data += b"".join(b"Extra%d: %d kB\n" % (i, i) for i in range(100))
+        data += b"MemTotal: 1 kB\n"  # Never reached by the scan
+        with patch('builtins.open', FakeOpen(data)):
+            mem = psutil.virtual_memory()
+        self.assertEqual(mem.total, 1000 * 1024)
+        self.assertEqual(mem.available, 500 * 1024)
+
+    @patch('builtins.open', new_callable=partial(FakeOpen, b"processor : 0\nprocessor : 1\n"))
     def test_cpu_count(self, mock_file):
         """Test CPU count parsing."""
-        # Clear both caches to ensure fresh test
-        if hasattr(psutil.cpu_count, '_cached_count'):
-            delattr(psutil.cpu_count, '_cached_count')
-        
-        # Clear mocking cache and force cache bypass
-        if hasattr(core, '_clear_mocking_cache'):
-            core._clear_mocking_cache()
-        
-        # Temporarily patch the cache function to return True (force cache bypass)
-        with patch.object(core, '_is_mocking_cached', return_value=True):
+        # Clear the cache to ensure fresh test
+        psutil.cpu_count.cache_clear()
+        try:
             count = psutil.cpu_count()
             self.assertEqual(count, 2)
-        
+        finally:
+            psutil.cpu_count.cache_clear()
+
+    @patch('builtins.open', new_callable=partial(
+        FakeOpen, b"processor : 0\nprocessor : 1\nprocessor : 2\n"))
+    def test_cpu_count_memoized(self, mock_file):
+        """Test that cpu_count() parses /proc/cpuinfo only once."""
+        psutil.cpu_count.cache_clear()
+        try:
+            counts = [psutil.cpu_count() for _ in range(3)]
+            self.assertEqual(counts, [3, 3, 3])
+            self.assertEqual(mock_file.call_count, 1)
+        finally:
+            psutil.cpu_count.cache_clear()
+
+    def test_parse_cpu_line(self):
+        """Test bytes-level parsing of the /proc/stat cpu line."""
+        self.assertEqual(core._parse_cpu_line(b"cpu  100 200 300 400 500 600 700"),
+                         [100, 200, 300, 400, 500])
+        self.assertEqual(core._parse_cpu_line(b"cpu  1 abc 3"), [1, 0, 3])
+        self.assertEqual(core._parse_cpu_line(b"cpu  1000 -500 2000 -100"),
+                         [1000, 0, 2000, 0])
+        self.assertEqual(core._parse_cpu_line(b"cpu"), [])
+
+    def test_read_procfile_large_file(self):
+        """Test that files larger than the read buffer are read completely."""
+        import tempfile
+        data = b''.join(b'processor : %d\n' % i for i in range(1000))
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(data)
+        try:
+            self.assertEqual(core._read_procfile(f.name, bufsize=4096), data)
+            self.assertEqual(core._read_procfile(f.name), data)
+        finally:
+            os.unlink(f.name)
+
+    def test_read_procfile_short_reads(self):
+        """Test that a short read is not taken as end of file.
+
+        seq_file files such as /proc/cpuinfo return whole records per read().
+        """
+        class SeqFile(FakeFile):
+            def read(self, size=-1):
+                end = self._data.find(b'\n\n', self._pos)
+                end = len(self._data) if end == -1 else end + 2
+                return super().read(min(size, end - self._pos))
+
+        cpuinfo = b''.join(b'processor\t: %d\nmodel name\t: x\n\n' % i for i in range(16))
+        with patch('builtins.open', return_value=SeqFile(cpuinfo)):
+            self.assertEqual(core._read_procfile('/proc/cpuinfo'), cpuinfo)
+        psutil.cpu_count.cache_clear()
+        try:
+            with patch('builtins.open', side_effect=lambda *args, **kwargs: SeqFile(cpuinfo)):
+                self.assertEqual(psutil.cpu_count(), 16)
+        finally:
+            psutil.cpu_count.cache_clear()
+
+    def test_looks_binary(self):
+        """Test the binary-data pre-check used by the /proc parsers."""
+        self.assertTrue(core._looks_binary(b'\x00\x01\x02\x03\x04\x05'))
+        self.assertFalse(core._looks_binary(b'cpu  100 200 300\n'))
+        self.assertFalse(core._looks_binary("model name\t: Intel®\r\n".encode('utf-8')))
+        self.assertFalse(core._looks_binary(b''))
+        # Only the leading bytes are probed
+        self.assertFalse(core._looks_binary(b'a' * 64 + b'\x00'))
+
+        with patch('builtins.open', FakeOpen(b'\x00\x01\x02\x03')):
+            self.assertEqual(psutil.virtual_memory().total, 0)
+            self.assertEqual(psutil.cpu_times().user, 0)
+
+    @patch('time.sleep')
+    def test_read_with_retry(self, mock_sleep):
+        """Test that transient read errors are retried with backoff."""
+        with patch.object(core, '_read_procfile',
+                          side_effect=[OSError("busy"), OSError("busy"), b"ok"]) as mock_read:
+            self.assertEqual(core._read_with_retry('/proc/stat'), b"ok")
+            self.assertEqual(mock_read.call_count, 3)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.001, 0.002])
+
+        # Permanent errors are not retried
+        with patch.object(core, '_read_procfile',
+                          side_effect=FileNotFoundError("gone")) as mock_read:
+            with self.assertRaises(FileNotFoundError):
+                core._read_with_retry('/proc/stat')
+            self.assertEqual(mock_read.call_count, 1)
+
+        # Persistent transient errors are raised after the last try
+        with patch.object(core, '_read_procfile', side_effect=OSError("busy")):
+            with self.assertRaises(OSError):
+                core._read_with_retry('/proc/stat')
+
     @patch('os.listdir')
     def test_pids(self, mock_listdir):
         """Test PID listing."""
@@ -110,6 +280,7 @@ class TestProcessClass(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.test_pid = 1234
+        reset_caches()
         
     @patch('os.path.exists')
     def test_process_init(self, mock_exists):
@@ -125,7 +296,7 @@ class TestProcessClass(unittest.TestCase):
             psutil.Process(99999)
             
     @patch('os.path.exists', return_value=True)
-    @patch('builtins.open', new_callable=mock_open, read_data="test_process")
+    @patch('builtins.open', new_callable=partial(FakeOpen, b"test_process"))
     def test_process_name(self, mock_file, mock_exists):
         """Test process name retrieval."""
         proc = psutil.Process(self.test_pid)
@@ -133,8 +304,7 @@ class TestProcessClass(unittest.TestCase):
         self.assertEqual(name, "test_process")
         
     @patch('os.path.exists', return_value=True)
-    @patch('builtins.open', new_callable=mock_open, 
-           read_data="arg1\x00arg2\x00arg3\x00")
+    @patch('builtins.open', new_callable=partial(FakeOpen, b"arg1\x00arg2\x00arg3\x00"))
     def test_process_cmdline(self, mock_file, mock_exists):
         """Test process command line parsing."""
         proc = psutil.Process(self.test_pid)
@@ -142,8 +312,8 @@ class TestProcessClass(unittest.TestCase):
         self.assertEqual(cmdline, ["arg1", "arg2", "arg3"])
         
     @patch('os.path.exists', return_value=True)
-    @patch('builtins.open', new_callable=mock_open,
-           read_data="VmRSS: 1000 kB\nVmSize: 2000 kB\n")
+    @patch('builtins.open', new_callable=partial(
+        FakeOpen, b"VmRSS: 1000 kB\nVmSize: 2000 kB\n"))
     def test_process_memory_info(self, mock_file, mock_exists):
         """Test process memory information."""
         proc = psutil.Process(self.test_pid)
@@ -222,6 +392,10 @@ class TestPerformance(unittest.TestCase):
 class TestErrorHandling(unittest.TestCase):
     """Test error handling and edge cases."""
     
+    def setUp(self):
+        """Start from empty library caches, as conftest.py does under pytest."""
+        reset_caches()
+        
     @patch('builtins.open', side_effect=PermissionError("Access denied"))
     @patch('os.path.exists', return_value=True)
     def test_access_denied_handling(self, mock_exists, mock_open):
@@ -239,7 +413,7 @@ class TestErrorHandling(unittest.TestCase):
         
     def test_malformed_proc_files(self):
         """Test handling of malformed /proc files."""
-        with patch('builtins.open', new_callable=mock_open, read_data="invalid data"):
+        with patch('builtins.open', FakeOpen(b"invalid data")):
             # Should not crash
             times = psutil.cpu_times()
             self.assertIsInstance(times, psutil.CPUTimes)
@@ -7,7 +7,6 @@ error conditions, and stress testing scenarios.
 """
 
 import os
-import sys
 import time
 import unittest
 import threading
@@ -15,15 +14,13 @@ import tempfile
 import subprocess
 import gc
 import weakref
-from unittest.mock import patch, mock_open, MagicMock, call, PropertyMock
-from pathlib import Path
+from unittest.mock import patch, MagicMock, call, PropertyMock
 from io import StringIO
 import concurrent.futures
 
-# Add the package to the path for testing
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import psutil_cygwin as psutil
+from tests.fakefile import FakeOpen
+from tests._caches import reset_caches
 
 
 class TestExceptionsComprehensive(unittest.TestCase):
@@ -135,18 +132,19 @@ class TestSystemFunctionsComprehensive(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.temp_dir = tempfile.mkdtemp()
+        reset_caches()
         
     def tearDown(self):
         """Clean up test fixtures."""
         import shutil
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
-    @patch('builtins.open', new_callable=mock_open)
+    @patch('builtins.open')
     @patch('os.sysconf')
     def test_cpu_times_edge_cases(self, mock_sysconf, mock_file):
         """Test CPU times parsing with various edge cases."""
         # Normal case
-        mock_file.return_value.read.return_value = "cpu  100 200 300 400 500 600 700 800\n"
+        mock_file.side_effect = FakeOpen(b"cpu  100 200 300 400 500 600 700 800\n")
         mock_sysconf.return_value = 100
         times = psutil.cpu_times()
         self.assertEqual(times.user, 1.0)
@@ -154,50 +152,57 @@ class TestSystemFunctionsComprehensive(unittest.TestCase):
         self.assertEqual(times.idle, 4.0)
         
         # Minimal fields
-        mock_file.return_value.read.return_value = "cpu  100\n"
+        mock_file.side_effect = FakeOpen(b"cpu  100\n")
+        reset_caches()
         times = psutil.cpu_times()
         self.assertEqual(times.user, 1.0)
         self.assertEqual(times.system, 0)
         
         # Empty file
-        mock_file.return_value.read.return_value = ""
+        mock_file.side_effect = FakeOpen(b"")
+        reset_caches()
         times = psutil.cpu_times()
         self.assertEqual(times.user, 0)
         self.assertEqual(times.system, 0)
         
         # Malformed data
-        mock_file.return_value.read.return_value = "invalid data"
+        mock_file.side_effect = FakeOpen(b"invalid data")
+        reset_caches()
         times = psutil.cpu_times()
         self.assertEqual(times.user, 0)
         
         # Very large numbers
-        mock_file.return_value.read.return_value = "cpu  999999999999 888888888888 777777777777 666666666666\n"
+        mock_file.side_effect = FakeOpen(b"cpu  999999999999 888888888888 777777777777 666666666666\n")
         mock_sysconf.return_value = 1
+        reset_caches()
         times = psutil.cpu_times()
         self.assertEqual(times.user, 999999999999)
         
         # Zero values
-        mock_file.return_value.read.return_value = "cpu  0 0 0 0 0\n"
+        mock_file.side_effect = FakeOpen(b"cpu  0 0 0 0 0\n")
+        reset_caches()
         times = psutil.cpu_times()
         self.assertEqual(times.user, 0.0)
         self.assertEqual(times.system, 0.0)
         self.assertEqual(times.idle, 0.0)
         
         # Missing cpu line
-        mock_file.return_value.read.return_value = "notcpu  100 200 300\n"
+        mock_file.side_effect = FakeOpen(b"notcpu  100 200 300\n")
+        reset_caches()
         times = psutil.cpu_times()
         self.assertEqual(times.user, 0)
         
         # File access error
         mock_file.side_effect = OSError("Permission denied")
+        reset_caches()
         times = psutil.cpu_times()
         self.assertEqual(times.user, 0)
         
         # Different clock tick rates
-        mock_file.return_value.read.return_value = "cpu  1000 2000 3000 4000\n"
-        mock_file.side_effect = None
+        mock_file.side_effect = FakeOpen(b"cpu  1000 2000 3000 4000\n")
         for tick_rate in [1, 10, 100, 1000, 10000]:
             mock_sysconf.return_value = tick_rate
+            reset_caches()
             times = psutil.cpu_times()
             self.assertEqual(times.user, 1000 / tick_rate)
 